@@ -2,17 +2,19 @@
 CLI entry point for ebook-calibre-analyzer.
 """
 
+import os
+import stat
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from .cli import create_parser, get_default_output_path, parse_size
 from .comparison import LibraryComparator
 from .copier import FileCopier
-from .csv_handler import CSVHandler
+from .csv_handler import CSVHandler, HashCache
 from .discovery import discover_files_recursive
 from .hashing import CPUHashProcessor
 from .hashing.orchestrator import HashingOrchestrator
@@ -32,6 +34,35 @@ def _configure_logging(verbose: bool = False) -> None:
     )
 
 
+def _stat_path(path: Path) -> Optional[os.stat_result]:
+    """Stat a path once, returning None if it can't be reached."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _require_directory(path: Path, description: str) -> bool:
+    """
+    Check that a path exists and is a directory, logging an error if not.
+
+    Args:
+        path: Path to validate
+        description: Human-readable name for the path in error messages
+
+    Returns:
+        True if the path is an existing directory
+    """
+    path_stat = _stat_path(path)
+    if path_stat is None:
+        logger.error(f"{description} does not exist: {path}")
+        return False
+    if not stat.S_ISDIR(path_stat.st_mode):
+        logger.error(f"{description} is not a directory: {path}")
+        return False
+    return True
+
+
 def run_analyze(args) -> int:
     """Run analyze command."""
     _configure_logging(verbose=args.verbose)
@@ -40,12 +71,10 @@ def run_analyze(args) -> int:
     calibre_path = Path(args.calibre_library_folder).resolve()
 
     # Validate paths
-    if not ebooks_path.exists():
-        logger.error(f"Ebooks folder does not exist: {ebooks_path}")
+    if not _require_directory(ebooks_path, "Ebooks folder"):
         return 1
 
-    if not calibre_path.exists():
-        logger.error(f"Calibre library folder does not exist: {calibre_path}")
+    if not _require_directory(calibre_path, "Calibre library folder"):
         return 1
 
     # Determine output path
@@ -95,8 +124,9 @@ def run_analyze(args) -> int:
         if not resume_path.exists():
             logger.error(f"Resume CSV file does not exist: {resume_path}")
             return 1
+        # The handler scans the CSV once in resume mode; reuse that set
         csv_handler = CSVHandler(resume_path, resume_mode=True)
-        processed_files = csv_handler.get_processed_files()
+        processed_files = csv_handler.processed_files
         output_path = resume_path
         logger.info(f"Resuming from: {resume_path}")
         logger.info(f"Found {len(processed_files)} already processed files")
@@ -136,16 +166,23 @@ def run_analyze(args) -> int:
     logger.debug("Building file collections...")
     ebooks_collection = FileCollection()
     # Only add files that aren't skipped (skip files are already in CSV)
-    files_to_process = categorized["gpu"] + categorized["cpu"]
-    for file in files_to_process:
-        ebooks_collection.add_file(file)
+    ebooks_collection.extend(categorized["gpu"])
+    ebooks_collection.extend(categorized["cpu"])
 
     calibre_collection = FileCollection()
-    for file in calibre_files:
-        calibre_collection.add_file(file)
+    calibre_collection.extend(calibre_files)
+
+    # Resumable runs cache hashes next to the output CSV so a resumed run skips unchanged files
+    hash_cache = None
+    if args.hash_cache or args.resume is not None:
+        hash_cache_path = output_path.parent / f"{output_path.stem}_hashes.csv"
+        hash_cache = HashCache(hash_cache_path)
+        logger.info(f"Hash cache: {hash_cache_path}")
+        if len(hash_cache):
+            logger.info(f"Loaded {len(hash_cache)} cached hashes from: {hash_cache_path}")
 
     # Initialize hash processors
-    cpu_processor = CPUHashProcessor(num_workers=args.workers)
+    cpu_processor = CPUHashProcessor(num_workers=args.workers, hash_cache=hash_cache)
     gpu_processor = None
 
     # Check GPU availability - GPUHashProcessor will handle the check internally
@@ -153,7 +190,11 @@ def run_analyze(args) -> int:
         try:
             from .hashing import GPUHashProcessor
 
-            gpu_processor = GPUHashProcessor(device_id=args.gpu_device)
+            gpu_processor = GPUHashProcessor(
+                device_id=args.gpu_device,
+                kernel_max_size=parse_size(args.gpu_threshold),
+                cpu_processor=cpu_processor,
+            )
             if gpu_processor._gpu_available:
                 logger.info("GPU hash processor available")
             else:
@@ -185,42 +226,50 @@ def run_analyze(args) -> int:
         calibre_collection=calibre_collection,
     )
 
-    # Stage 1: Size comparison
-    logger.info("Stage 1: Size comparison...")
-    stage1_unique, stage2_candidates = comparator.stage1.compare()
-    logger.info(f"  {len(stage1_unique)} files unique by size")
-    logger.info(f"  {len(stage2_candidates)} files need further checking")
-
-    # Stage 2: First 1KB hash comparison
-    stage2_unique = []
-    stage3_candidates = []
-    if stage2_candidates:
-        logger.info("Stage 2: First 1KB hash comparison...")
-
-        # Preprocessing: Hash files for Stage 2
-        hashing_orchestrator.hash_stage2_files(stage2_candidates)
-
-        # Comparison: Compare hashed files
-        stage2_unique, stage3_candidates = comparator.stage2.compare(stage2_candidates)
-        logger.info(f"  {len(stage2_unique)} files unique by 1KB hash")
-        logger.info(f"  {len(stage3_candidates)} files need full hash comparison")
-        logger.info("")  # Empty line for readability
-
-    # Stage 3: Full file hash comparison
-    stage3_unique = []
-    if stage3_candidates:
-        logger.info("Stage 3: Full file hash comparison...")
-
-        # Preprocessing: Hash files for Stage 3
-        hashing_orchestrator.hash_stage3_files(
-            stage3_candidates,
-            gpu_available=gpu_available,
-            gpu_threshold=gpu_threshold,
-            processed_files=processed_files,
-        )
+    # Save cached hashes even if a stage is interrupted, so a resumed run keeps them
+    try:
+        # Stage 1: Size comparison
+        logger.info("Stage 1: Size comparison...")
+        stage1_unique, stage2_candidates = comparator.stage1.compare()
+        logger.info(f"  {len(stage1_unique)} files unique by size")
+        logger.info(f"  {len(stage2_candidates)} files need further checking")
+
+        # Stage 2: First 1KB hash comparison
+        stage2_unique = []
+        stage3_candidates = []
+        if stage2_candidates:
+            logger.info("Stage 2: First 1KB hash comparison...")
+
+            # Preprocessing: Hash files for Stage 2
+            hashing_orchestrator.hash_stage2_files(stage2_candidates)
+
+            # Comparison: Compare hashed files
+            stage2_unique, stage3_candidates = comparator.stage2.compare(stage2_candidates)
+            logger.info(f"  {len(stage2_unique)} files unique by 1KB hash")
+            logger.info(f"  {len(stage3_candidates)} files need full hash comparison")
+            logger.info("")  # Empty line for readability
+
+        # Stage 3: Full file hash comparison
+        stage3_unique = []
+        if stage3_candidates:
+            logger.info("Stage 3: Full file hash comparison...")
+
+            # Preprocessing: Hash files for Stage 3
+            hashing_orchestrator.hash_stage3_files(
+                stage3_candidates,
+                gpu_available=gpu_available,
+                gpu_threshold=gpu_threshold,
+                processed_files=processed_files,
+            )
 
-        # Comparison: Compare hashed files
-        stage3_unique = comparator.stage3.compare(stage3_candidates)
+            # Comparison: Compare hashed files
+            stage3_unique = comparator.stage3.compare(stage3_candidates)
+    finally:
+        if hash_cache is not None:
+            hash_cache.save()
+        # Pooled GPU memory is reused across stages, so release it only once hashing is done
+        if gpu_processor is not None:
+            gpu_processor.cleanup()
 
     # Collect all unique files
     unique_files = stage1_unique + stage2_unique + stage3_unique
@@ -311,9 +360,10 @@ def run_analyze(args) -> int:
     # Delete existing file first to ensure clean overwrite
     if output_path.exists():
         output_path.unlink()
-    final_csv_handler = CSVHandler(output_path, batch_size=args.batch_size, resume_mode=False)
-    final_csv_handler.write_batch(deduplicated_files)
-    final_csv_handler.flush()
+    with CSVHandler(
+        output_path, batch_size=args.batch_size, resume_mode=False
+    ) as final_csv_handler:
+        final_csv_handler.write_batch(deduplicated_files)
     unique_files = deduplicated_files
 
     # Write duplicates report if duplicates were found
@@ -360,12 +410,12 @@ def run_copy(args) -> int:
         logger.error(f"CSV file does not exist: {csv_path}")
         return 1
 
-    if not ebooks_path.exists():
-        logger.error(f"Ebooks folder does not exist: {ebooks_path}")
+    if not _require_directory(ebooks_path, "Ebooks folder"):
         return 1
 
     # Validate target path
-    if target_path.exists() and target_path.is_file():
+    target_stat = _stat_path(target_path)
+    if target_stat is not None and stat.S_ISREG(target_stat.st_mode):
         logger.error(
             f"Target path exists as a file: {target_path}. "
             f"Please specify a directory path or remove/rename the file."
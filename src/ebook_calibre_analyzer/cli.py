@@ -51,6 +51,13 @@ def create_analyze_parser(subparsers) -> argparse.ArgumentParser:
 
     parser.add_argument("--resume", type=Path, default=None, help="Resume from existing CSV file")
 
+    parser.add_argument(
+        "--hash-cache",
+        action="store_true",
+        help="Cache file hashes in <csv stem>_hashes.csv next to the output CSV, so a later "
+        "--resume skips unchanged files (always on with --resume)",
+    )
+
     parser.add_argument(
         "--use-gpu", action="store_true", help="Enable GPU acceleration for hashing (requires CUDA)"
     )
@@ -60,8 +67,8 @@ def create_analyze_parser(subparsers) -> argparse.ArgumentParser:
     parser.add_argument(
         "--gpu-threshold",
         type=str,
-        default="100MB",
-        help="File size threshold for GPU processing (default: 100MB)",
+        default="1MB",
+        help="Largest file hashed on the GPU; larger files stay on the CPU (default: 1MB)",
     )
 
     parser.add_argument(
@@ -69,7 +76,7 @@ def create_analyze_parser(subparsers) -> argparse.ArgumentParser:
     )
 
     parser.add_argument(
-        "--workers", type=int, default=10, help="CPU worker processes (default: 10)"
+        "--workers", type=int, default=10, help="CPU hashing threads (default: 10)"
     )
 
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
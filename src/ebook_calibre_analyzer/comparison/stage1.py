@@ -28,7 +28,8 @@ class Stage1Comparator:
         Returns:
             Tuple of (unique_files, candidates_for_stage2)
         """
-        calibre_sizes = self.calibre_collection.get_unique_sizes()
+        # Membership on the size index itself avoids copying its keys into a new set
+        calibre_sizes = self.calibre_collection.by_size
         unique_files = []
         candidates = []
 
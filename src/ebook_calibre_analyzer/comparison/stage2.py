@@ -39,6 +39,9 @@ class Stage2Comparator:
         """
         unique_files = []
         candidates = []
+        # Digests are compared by dict lookup on the (size, 1KB hash) index, so
+        # each file costs one hash probe rather than comparisons against peers
+        lookup_size_and_1k = self.calibre_collection.by_size_and_1k.get
 
         for file in stage2_candidates:
             if file.first_1k_hash is None:
@@ -47,9 +50,7 @@ class Stage2Comparator:
                 file.processing_status = "1k_hashed"
                 continue
 
-            calibre_matches = self.calibre_collection.get_files_by_size_and_1k(
-                file.get_size_hash(), file.first_1k_hash
-            )
+            calibre_matches = lookup_size_and_1k((file.get_size_hash(), file.first_1k_hash))
 
             if not calibre_matches:
                 # Unique by 1KB hash
@@ -42,6 +42,7 @@ class Stage3Comparator:
             List of unique files
         """
         unique_files = []
+        lookup_full_hash = self.calibre_collection.by_full_hash.get
 
         for file in stage3_candidates:
             # Get hash from file object (already set during hashing preprocessing)
@@ -51,7 +52,7 @@ class Stage3Comparator:
                 file.processing_status = "full_hashed"
                 continue
 
-            calibre_match = self.calibre_collection.get_file_by_full_hash(file.full_hash)
+            calibre_match = lookup_full_hash(file.full_hash)
 
             if calibre_match is None:
                 # Unique by full hash
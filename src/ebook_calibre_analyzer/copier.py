@@ -2,13 +2,165 @@
 File copying module with flat structure and conflict resolution.
 """
 
+import errno
+import os
 import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Set, Tuple
 
 from .models import EbookFile
 from .utils import generate_random_suffix
 
+# Bytes requested per copy_file_range/sendfile call
+_KERNEL_COPY_CHUNK = 64 * 1024 * 1024
+
+# Buffer size for the user-space copy fallback
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Per-thread copy buffer, allocated once and reused by every fallback copy on
+# that thread (copy_all runs copies on a thread pool)
+_copy_buffers = threading.local()
+
+# Errors meaning a kernel copy primitive can't handle this pair of files, as
+# opposed to a real I/O failure
+_UNSUPPORTED_COPY_ERRNOS = frozenset(
+    {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+)
+
+
+# Linux FICLONE ioctl: make dst share src's extents (reflink) on CoW filesystems
+_FICLONE = 0x40049409
+
+# Errors meaning the filesystem pair can't reflink
+_UNSUPPORTED_CLONE_ERRNOS = _UNSUPPORTED_COPY_ERRNOS | {errno.ENOTTY}
+
+# (source st_dev, target st_dev) pairs where FICLONE already failed, so each
+# pair of filesystems pays for at most one failing ioctl
+_reflink_unsupported: Set[Tuple[int, int]] = set()
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    """
+    Clone src_fd into dst_fd with FICLONE, if the filesystems support it.
+
+    A reflink copies no data: both files share extents until one is modified,
+    so the copy takes constant time regardless of file size.
+
+    Returns:
+        True if the file was cloned, False if a regular copy is needed
+    """
+    device_pair = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+    if device_pair in _reflink_unsupported:
+        return False
+
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_CLONE_ERRNOS:
+            raise
+        _reflink_unsupported.add(device_pair)
+        return False
+
+
+def _get_copy_buffer() -> bytearray:
+    """Get this thread's reusable copy buffer, allocating it on first use."""
+    buffer = getattr(_copy_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _copy_buffers.buffer = bytearray(_COPY_BUFFER_SIZE)
+    return buffer
+
+
+def _copy_fd_data(src_fd: int, dst_fd: int) -> None:
+    """
+    Copy the remaining contents of src_fd to dst_fd, preferring in-kernel copies.
+
+    Tries copy_file_range (lets the filesystem share extents or copy server-side),
+    then sendfile, then a read/write loop over this thread's reusable buffer. Each step
+    continues from the current file offsets, so a fallback after a partial copy
+    resumes where the previous method stopped.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(src_fd, dst_fd, _KERNEL_COPY_CHUNK):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                raise
+
+    if hasattr(os, "sendfile"):
+        try:
+            while os.sendfile(dst_fd, src_fd, None, _KERNEL_COPY_CHUNK):
+                pass
+            return
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                raise
+
+    buffer = _get_copy_buffer()
+    view = memoryview(buffer)
+    while True:
+        n = os.readv(src_fd, [buffer])
+        if not n:
+            break
+        written = 0
+        while written < n:
+            written += os.write(dst_fd, view[written:n])
+
+
+def _copy_file(source: str, target: str) -> None:
+    """
+    Copy a file's data and metadata, like shutil.copy2.
+
+    On Linux the file is reflinked where the filesystem allows it, otherwise
+    its data is copied with kernel-side primitives; elsewhere this defers to
+    shutil.copy2, which already uses the platform's fast path.
+
+    Raises:
+        shutil.SameFileError: If target is the source file or a hardlink to it
+        OSError: If the copy fails or the target ends up shorter than the source
+    """
+    if not sys.platform.startswith("linux"):
+        shutil.copy2(source, target)
+        return
+
+    src_fd = os.open(source, os.O_RDONLY)
+    try:
+        src_stat = os.fstat(src_fd)
+        # Opening the target truncates it, which would wipe a source that is
+        # the same file (or a hardlink to it); copy2 refuses this too
+        try:
+            if os.path.samestat(src_stat, os.stat(target)):
+                raise shutil.SameFileError(f"{source!r} and {target!r} are the same file")
+        except FileNotFoundError:
+            pass
+
+        dst_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if not _try_reflink(src_fd, dst_fd):
+                _copy_fd_data(src_fd, dst_fd)
+            copied = os.fstat(dst_fd).st_size
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    if copied != src_stat.st_size:
+        raise OSError(
+            errno.EIO,
+            f"Short copy: wrote {copied} of {src_stat.st_size} bytes",
+            target,
+        )
+
+    # Permissions, timestamps and extended attributes, as copy2 does
+    shutil.copystat(source, target)
+
 
 class FileCopier:
     """
@@ -41,6 +193,12 @@ class FileCopier:
         self.target_folder = Path(target_folder)
         self.conflict_handling = conflict_handling
         self.num_workers = num_workers
+        # Targets handed out during this copier's lifetime, so concurrent copies
+        # don't pick the same path before either file exists on disk
+        self._claimed_targets: Set[Path] = set()
+        self._claim_lock = threading.Lock()
+        # Set once the target folder is known to exist
+        self._target_ready = False
 
         if conflict_handling not in ["rename", "skip", "overwrite"]:
             raise ValueError(f"Invalid conflict_handling: {conflict_handling}")
@@ -78,7 +236,7 @@ class FileCopier:
             new_name = f"{stem}_{random_suffix}{suffix}"
             new_path = target.parent / new_name
 
-            if not new_path.exists():
+            if not self._is_target_taken(new_path):
                 return new_path
 
         # If we can't find a unique name, append a counter
@@ -86,10 +244,14 @@ class FileCopier:
         while True:
             new_name = f"{stem}_{counter}{suffix}"
             new_path = target.parent / new_name
-            if not new_path.exists():
+            if not self._is_target_taken(new_path):
                 return new_path
             counter += 1
 
+    def _is_target_taken(self, target: Path) -> bool:
+        """Check whether a target path exists or was claimed by another copy."""
+        return target in self._claimed_targets or target.exists()
+
     def copy_file(self, file: EbookFile, dry_run: bool = False) -> Dict[str, any]:
         """
         Copy a single file to target folder.
@@ -113,20 +275,24 @@ class FileCopier:
         # Target is always flat: target_folder / filename
         target_path = self.target_folder / file.filename
 
-        # Handle conflicts
-        if target_path.exists():
-            if self.conflict_handling == "skip":
-                return {
-                    "success": False,
-                    "source": str(file.full_path),
-                    "target": str(target_path),
-                    "message": f"Target file exists, skipping: {target_path}",
-                }
-            elif self.conflict_handling == "rename":
-                target_path = self._resolve_filename_conflict(file.filename, target_path)
-            elif self.conflict_handling == "overwrite":
-                # Will overwrite, no change needed
-                pass
+        # Handle conflicts; resolve and claim the target atomically across workers
+        with self._claim_lock:
+            if self._is_target_taken(target_path):
+                if self.conflict_handling == "skip":
+                    return {
+                        "success": False,
+                        "source": str(file.full_path),
+                        "target": str(target_path),
+                        "message": f"Target file exists, skipping: {target_path}",
+                    }
+                elif self.conflict_handling == "rename":
+                    target_path = self._resolve_filename_conflict(file.filename, target_path)
+                elif self.conflict_handling == "overwrite":
+                    # Will overwrite, no change needed
+                    pass
+
+            if not dry_run:
+                self._claimed_targets.add(target_path)
 
         if dry_run:
             return {
@@ -136,37 +302,41 @@ class FileCopier:
                 "message": f"Would copy to: {target_path}",
             }
 
-        # Ensure target directory exists
-        # If path exists as a file, raise an error (can't create directory where file exists)
-        if self.target_folder.exists() and self.target_folder.is_file():
-            raise FileExistsError(
-                f"Cannot create target directory: {self.target_folder} exists as a file"
-            )
-        
-        # Try to create target directory with better error handling
-        try:
-            self.target_folder.mkdir(parents=True, exist_ok=True)
-        except PermissionError as e:
-            return {
-                "success": False,
-                "source": str(file.full_path),
-                "target": str(target_path),
-                "message": f"Permission denied creating target directory {self.target_folder}: {e}",
-            }
-        except OSError as e:
-            return {
-                "success": False,
-                "source": str(file.full_path),
-                "target": str(target_path),
-                "message": f"Failed to create target directory {self.target_folder}: {e}",
-            }
+        # Ensure target directory exists, once per copier rather than per file
+        if not self._target_ready:
+            # If path exists as a file, raise an error (can't create directory where file exists)
+            if self.target_folder.exists() and self.target_folder.is_file():
+                raise FileExistsError(
+                    f"Cannot create target directory: {self.target_folder} exists as a file"
+                )
+
+            # Try to create target directory with better error handling
+            try:
+                self.target_folder.mkdir(parents=True, exist_ok=True)
+            except PermissionError as e:
+                return {
+                    "success": False,
+                    "source": str(file.full_path),
+                    "target": str(target_path),
+                    "message": (
+                        f"Permission denied creating target directory {self.target_folder}: {e}"
+                    ),
+                }
+            except OSError as e:
+                return {
+                    "success": False,
+                    "source": str(file.full_path),
+                    "target": str(target_path),
+                    "message": f"Failed to create target directory {self.target_folder}: {e}",
+                }
+            self._target_ready = True
 
         # Copy file
         # Note: We don't use os.access() checks here because they can give false negatives
         # on WSL mounts. The actual copy operation will fail with a proper error if there
         # are real permission issues.
         try:
-            shutil.copy2(file.full_path, target_path)
+            _copy_file(file.full_path_str, str(target_path))
             # Verify the copy actually succeeded by checking if target exists and has content
             if not target_path.exists():
                 return {
@@ -225,8 +395,12 @@ class FileCopier:
 
         stats = {"total": len(files), "success": 0, "failed": 0, "skipped": 0, "results": []}
 
-        for file in files:
-            result = self.copy_file(file, dry_run=dry_run)
+        if dry_run or self.num_workers <= 1 or len(files) <= 1:
+            results = [self.copy_file(file, dry_run=dry_run) for file in files]
+        else:
+            results = self._copy_concurrently(files)
+
+        for result in results:
             stats["results"].append(result)
 
             if result["success"]:
@@ -237,3 +411,32 @@ class FileCopier:
                 stats["failed"] += 1
 
         return stats
+
+    def _copy_concurrently(self, files: List[EbookFile]) -> List[Dict[str, Any]]:
+        """
+        Copy files on a thread pool, returning results in input order.
+
+        Files sharing a filename map to the same target, so each such group is
+        copied in order by one worker, keeping conflict handling the same as a
+        sequential copy.
+
+        Args:
+            files: EbookFiles to copy
+
+        Returns:
+            List of copy_file results, one per file
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, file in enumerate(files):
+            groups.setdefault(file.filename, []).append(index)
+
+        def copy_group(indices: List[int]) -> List[Tuple[int, Dict[str, Any]]]:
+            return [(index, self.copy_file(files[index])) for index in indices]
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            indexed = [
+                pair for group in executor.map(copy_group, groups.values()) for pair in group
+            ]
+
+        indexed.sort(key=lambda pair: pair[0])
+        return [result for _, result in indexed]
@@ -3,16 +3,30 @@ CSV I/O handler with resume capability.
 """
 
 import csv
+import itertools
+import os
+import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set, TextIO, Tuple
 
 from .models import EbookFile
 
+# Characters besides the delimiter that make the csv module quote a field
+_NEEDS_QUOTING = re.compile(r'["\r\n]')
+
 
 class CSVHandler:
     """Handles CSV I/O with resume capability."""
 
+    FIELDS = ["relative_path", "filename", "file_size", "full_path", "processed_at"]
+
+    # Write buffer for the output file; rows reach disk on flush() or close()
+    _WRITE_BUFFER_SIZE = 1024 * 1024
+
+    # Bytes read per step when scanning back from the end for the last row
+    _TAIL_CHUNK_SIZE = 64 * 1024
+
     def __init__(self, csv_path: Path, batch_size: int = 100, resume_mode: bool = False):
         """
         Initialize CSV handler.
@@ -28,28 +42,81 @@ class CSVHandler:
         self._processed_files: Set[str] = set()
         self._buffer: List[EbookFile] = []
         self._header_written = False
-
-        if resume_mode and self.csv_path.exists():
-            # Load existing processed files
+        # Opened on first write and reused until close()
+        self._file: Optional[TextIO] = None
+        self._writer: Optional[csv.DictWriter] = None
+
+        if resume_mode:
+            # An interrupted run can leave a half-written last row; drop it so the
+            # file is reprocessed and appended rows start on a new line
+            self._drop_partial_row()
+            # Load existing processed files (empty if the file doesn't exist yet)
             self._processed_files = self.get_processed_files()
 
+    @property
+    def processed_files(self) -> Set[str]:
+        """Full paths already in the CSV, loaded once at init in resume mode."""
+        return self._processed_files
+
+    def __enter__(self) -> "CSVHandler":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # Release the handle if the handler is dropped without close()
+        file = getattr(self, "_file", None)
+        if file is not None:
+            file.close()
+
+    def _drop_partial_row(self) -> None:
+        """Truncate the CSV file after its last newline, if it does not end with one."""
+        try:
+            with open(self.csv_path, "rb+") as f:
+                end = f.seek(0, os.SEEK_END)
+                position = end
+                while position > 0:
+                    start = max(0, position - self._TAIL_CHUNK_SIZE)
+                    f.seek(start)
+                    newline = f.read(position - start).rfind(b"\n")
+                    if newline != -1:
+                        position = start + newline + 1
+                        break
+                    position = start
+                if position != end:
+                    f.truncate(position)
+        except FileNotFoundError:
+            pass
+
+    def _get_file(self) -> TextIO:
+        """Open the CSV file for appending if it is not already open."""
+        if self._file is None:
+            self._file = open(  # noqa: SIM115 - held open until close()
+                self.csv_path,
+                "a",
+                newline="",
+                encoding="utf-8",
+                buffering=self._WRITE_BUFFER_SIZE,
+            )
+        return self._file
+
+    def _get_writer(self) -> csv.DictWriter:
+        """Get the shared DictWriter, opening the CSV file if needed."""
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._get_file(), fieldnames=self.FIELDS)
+        return self._writer
+
     def write_header(self) -> None:
         """Write CSV header if not already written."""
         if self._header_written:
             return
 
-        # Check if file exists and has content
-        if self.csv_path.exists() and self.csv_path.stat().st_size > 0:
-            self._header_written = True
-            return
-
-        # Write header
-        with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["relative_path", "filename", "file_size", "full_path", "processed_at"],
-            )
-            writer.writeheader()
+        # The file is opened for appending, so its position is the existing size;
+        # an existing non-empty file already has its header
+        if self._get_file().tell() == 0:
+            self._get_writer().writeheader()
+            self.flush()
 
         self._header_written = True
 
@@ -72,27 +139,71 @@ class CSVHandler:
         if len(self._buffer) >= self.batch_size:
             self._flush_buffer()
 
+    @staticmethod
+    def _fast_row(file: EbookFile, processed_at: str) -> Optional[str]:
+        """
+        Format a CSV row directly, bypassing the csv module's per-field quoting.
+
+        Args:
+            file: EbookFile to serialize
+            processed_at: Timestamp for the processed_at column
+
+        Returns:
+            The row as a line of text, or None if any field needs quoting
+        """
+        fields = (
+            file.relative_path_str,
+            file.filename,
+            str(file.file_size),
+            file.full_path_str,
+            processed_at,
+        )
+        line = ",".join(fields)
+        # Any extra comma means a field contained one
+        if line.count(",") != len(fields) - 1 or _NEEDS_QUOTING.search(line):
+            return None
+        # Matches csv.writer's default dialect: comma separated, CRLF terminated
+        return line + "\r\n"
+
     def _flush_buffer(self) -> None:
-        """Flush buffer to CSV file."""
+        """Write buffered rows through the shared file without flushing it."""
         if not self._buffer:
             return
 
-        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["relative_path", "filename", "file_size", "full_path", "processed_at"],
-            )
-
-            for file in self._buffer:
+        stream = self._get_file()
+        writer = self._get_writer()
+        processed_at = datetime.now(timezone.utc).isoformat()
+        lines: List[str] = []
+        for file in self._buffer:
+            line = self._fast_row(file, processed_at)
+            if line is None:
+                # Let the csv module quote fields with commas, quotes or newlines
                 row = file.to_dict()
-                row["processed_at"] = datetime.now(timezone.utc).isoformat()
+                row["processed_at"] = processed_at
+                if lines:
+                    stream.write("".join(lines))
+                    lines.clear()
                 writer.writerow(row)
+            else:
+                lines.append(line)
+        if lines:
+            stream.write("".join(lines))
 
         self._buffer.clear()
 
     def flush(self) -> None:
-        """Flush any remaining buffer to CSV file."""
+        """Write any buffered rows and flush them to the CSV file."""
         self._flush_buffer()
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the CSV file. Further writes reopen it."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
 
     def read_all(self, base_path: Path) -> List[EbookFile]:
         """
@@ -127,15 +238,27 @@ class CSVHandler:
         Returns:
             Set of full path strings
         """
-        if not self.csv_path.exists():
-            return set()
-
-        processed = set()
-        with open(self.csv_path, encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if "full_path" in row:
-                    processed.add(row["full_path"])
+        processed: Set[str] = set()
+        try:
+            with open(self.csv_path, encoding="utf-8", newline="") as f:
+                header = next(csv.reader([f.readline()]), [])
+                if "full_path" not in header:
+                    return processed
+                column = header.index("full_path")
+
+                # Plain rows are split directly; from the first row with a quote
+                # (which may span lines), the csv module parses the rest
+                for line in f:
+                    if '"' in line:
+                        for row in csv.reader(itertools.chain([line], f)):
+                            if len(row) > column:
+                                processed.add(row[column])
+                        break
+                    fields = line.rstrip("\r\n").split(",")
+                    if len(fields) > column:
+                        processed.add(fields[column])
+        except FileNotFoundError:
+            return processed
 
         return processed
 
@@ -156,3 +279,126 @@ class CSVHandler:
                 count += 1
 
         return count
+
+
+class HashCache:
+    """
+    Persistent cache of computed hashes, stored as a CSV next to the results.
+
+    Entries are keyed by full path and stage and are only reused while the
+    file's size and modification time are unchanged, so a resumed run skips
+    rehashing files that have not been touched.
+    """
+
+    FIELDS = ["full_path", "stage", "file_size", "mtime_ns", "hash"]
+
+    def __init__(self, cache_path: Path):
+        """
+        Initialize hash cache, loading any existing entries.
+
+        Args:
+            cache_path: Path to cache CSV file
+        """
+        self.cache_path = Path(cache_path)
+        # (full_path, stage) -> (file_size, mtime_ns, hash)
+        self._entries: Dict[Tuple[str, str], Tuple[int, int, bytes]] = {}
+        self._pending: List[Dict[str, str]] = []
+
+        if self.cache_path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        """Load entries from the cache file, skipping malformed rows."""
+        with open(self.cache_path, encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                try:
+                    self._entries[(row["full_path"], row["stage"])] = (
+                        int(row["file_size"]),
+                        int(row["mtime_ns"]),
+                        bytes.fromhex(row["hash"]),
+                    )
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def file_stamp(full_path: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the (size, mtime_ns) pair that cache entries are validated against.
+
+        Take it before hashing a file and pass it to put(), so a file modified
+        while it was being hashed fails validation on the next run.
+
+        Args:
+            full_path: Full path of the file
+
+        Returns:
+            (file_size, mtime_ns), or None if the file cannot be stat'ed
+        """
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, full_path: str, stage: str) -> Optional[bytes]:
+        """
+        Get a cached hash if the file is unchanged since it was hashed.
+
+        Args:
+            full_path: Full path of the file
+            stage: Stage identifier ('1k' or 'full')
+
+        Returns:
+            Cached hash bytes, or None on a miss or if the file changed
+        """
+        entry = self._entries.get((full_path, stage))
+        if entry is None:
+            return None
+
+        file_size, mtime_ns, hash_value = entry
+        if self.file_stamp(full_path) != (file_size, mtime_ns):
+            return None
+        return hash_value
+
+    def put(
+        self, full_path: str, stage: str, hash_value: bytes, file_size: int, mtime_ns: int
+    ) -> None:
+        """
+        Record a computed hash. Call save() to persist new entries.
+
+        Args:
+            full_path: Full path of the file
+            stage: Stage identifier ('1k' or 'full')
+            hash_value: Computed hash bytes
+            file_size: File size from file_stamp(), taken before hashing
+            mtime_ns: Modification time from file_stamp(), taken before hashing
+        """
+        self._entries[(full_path, stage)] = (file_size, mtime_ns, hash_value)
+        self._pending.append(
+            {
+                "full_path": full_path,
+                "stage": stage,
+                "file_size": str(file_size),
+                "mtime_ns": str(mtime_ns),
+                "hash": hash_value.hex(),
+            }
+        )
+
+    def save(self) -> None:
+        """Append entries recorded since the last save to the cache file."""
+        if not self._pending:
+            return
+
+        write_header = not self.cache_path.exists() or self.cache_path.stat().st_size == 0
+        with open(self.cache_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            if write_header:
+                writer.writeheader()
+            # Later rows win on load, so changed files simply get a newer entry
+            writer.writerows(self._pending)
+
+        self._pending.clear()
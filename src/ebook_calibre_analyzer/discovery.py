@@ -2,12 +2,79 @@
 Recursive file discovery module for finding ebook files in nested directory structures.
 """
 
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, Tuple
 
 from .models import EbookFile
 from .utils import get_default_file_extensions
 
+# Directories listed concurrently; overlaps readdir/stat latency on network mounts
+_DISCOVERY_WORKERS = 32
+
+
+def _scan_directory(
+    directory: str,
+    relative_dir: Path,
+    extensions: Tuple[str, ...],
+    exclude_paths: Set[Path],
+) -> Tuple[List[EbookFile], List[Tuple[str, Path]]]:
+    """
+    List one directory, collecting matching files and subdirectories to visit.
+
+    Args:
+        directory: Directory to list
+        relative_dir: Path of directory relative to the discovery root
+        extensions: Normalized extensions to match
+        exclude_paths: Paths to skip (for resume mode)
+
+    Returns:
+        Tuple of (matching files, [(subdirectory, relative subdirectory), ...])
+    """
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                try:
+                    # Don't descend into symlinked directories, matching Path.rglob
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, relative_dir / name))
+                        continue
+
+                    matched = [ext for ext in extensions if name.endswith(ext)]
+                    if not matched or not entry.is_file():
+                        continue
+
+                    full_path = Path(entry.path)
+                    # Skip if in exclude_paths (for resume mode)
+                    if full_path in exclude_paths:
+                        continue
+
+                    file_size = entry.stat().st_size
+                except OSError:
+                    # Skip files we can't access (permissions, broken symlinks, etc.)
+                    continue
+
+                relative_path = relative_dir / name
+                for ext in matched:
+                    files.append(
+                        EbookFile(
+                            full_path=full_path,
+                            relative_path=relative_path,
+                            filename=name,
+                            file_size=file_size,
+                            file_extension=ext,
+                        )
+                    )
+    except OSError:
+        # Skip directories we can't access
+        pass
+
+    return files, subdirs
+
 
 def discover_files_recursive(
     base_path: Path, file_extensions: List[str] = None, exclude_paths: Set[Path] = None
@@ -22,7 +89,7 @@ def discover_files_recursive(
         exclude_paths: Set of paths to exclude from discovery (for resume mode)
 
     Returns:
-        List of EbookFile objects with full_path and relative_path set
+        List of EbookFile objects with full_path and relative_path set, sorted by full path
     """
     if file_extensions is None:
         file_extensions = get_default_file_extensions()
@@ -30,7 +97,6 @@ def discover_files_recursive(
     if exclude_paths is None:
         exclude_paths = set()
 
-    files = []
     base_path = Path(base_path).resolve()
 
     if not base_path.exists():
@@ -46,36 +112,26 @@ def discover_files_recursive(
         if not ext.startswith("."):
             ext = "." + ext
         normalized_extensions.add(ext)
+    extensions = tuple(sorted(normalized_extensions))
 
-    # Recursively find all matching files
-    for ext in normalized_extensions:
-        pattern = f"*{ext}"
-        try:
-            for file_path in base_path.rglob(pattern):
-                if file_path.is_file():
-                    # Skip if in exclude_paths (for resume mode)
-                    if file_path in exclude_paths:
-                        continue
-
-                    try:
-                        relative_path = file_path.relative_to(base_path)
-                        file_size = file_path.stat().st_size
-
-                        files.append(
-                            EbookFile(
-                                full_path=file_path,
-                                relative_path=relative_path,
-                                filename=file_path.name,
-                                file_size=file_size,
-                                file_extension=ext,
-                            )
+    # List directories on a thread pool, submitting subdirectories as they are found
+    files: List[EbookFile] = []
+    with ThreadPoolExecutor(max_workers=_DISCOVERY_WORKERS) as executor:
+        pending: Set[Future] = {
+            executor.submit(_scan_directory, str(base_path), Path(), extensions, exclude_paths)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, subdirs = future.result()
+                files.extend(found)
+                for directory, relative_dir in subdirs:
+                    pending.add(
+                        executor.submit(
+                            _scan_directory, directory, relative_dir, extensions, exclude_paths
                         )
-                    except (OSError, ValueError):
-                        # Skip files we can't access or process
-                        # (permissions, symlinks, etc.)
-                        continue
-        except (OSError, PermissionError):
-            # Skip directories we can't access
-            continue
+                    )
 
+    # Completion order varies between runs; sort for a stable result
+    files.sort(key=lambda file: file.full_path_str)
     return files
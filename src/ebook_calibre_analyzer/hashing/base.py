@@ -2,14 +2,21 @@
 Base hash processor interface.
 """
 
-from abc import ABC, abstractmethod
-from typing import List
+from abc import abstractmethod
+from typing import List, Protocol, runtime_checkable
 
 from ..models import EbookFile
 
 
-class HashProcessor(ABC):
-    """Abstract base class for hash processors."""
+@runtime_checkable
+class HashProcessor(Protocol):
+    """
+    Structural interface for hash processors.
+
+    Any object with these three methods satisfies the interface. Concrete
+    processors may still subclass it explicitly to have missing methods
+    reported at instantiation time.
+    """
 
     @abstractmethod
     def hash_first_1k(self, file: EbookFile) -> bytes:
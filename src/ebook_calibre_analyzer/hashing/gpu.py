@@ -3,43 +3,82 @@ GPU-accelerated hash processor (optional, requires CUDA/OpenCL).
 """
 
 import hashlib
-from typing import List
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, List, Optional, Tuple
 
 from ..models import EbookFile
 from .base import HashProcessor
+from .cpu import CPUHashProcessor
 from .pool import GPUMemoryPool
 
 
+@dataclass
+class _KernelLaunch:
+    """In-flight batch kernel launch awaiting its digests."""
+
+    results: List[bytes]
+    kernel_indices: List[int]
+    stream: Any = None
+    host_digests: Any = None
+    digest_size: int = 0
+    # (buffer, pinned) pairs to return to the pool once the stream completes
+    buffers: List[Tuple[Any, bool]] = field(default_factory=list)
+    # Device arrays that must stay alive until the kernel finishes
+    keep_alive: List[Any] = field(default_factory=list)
+
+
 class GPUHashProcessor(HashProcessor):
     """
     GPU-accelerated hasher with memory pooling.
 
     Uses CuPy for GPU memory management and data transfer.
-    For large files, uses chunked processing to fit within GPU memory limits.
+    The batch kernel hashes each file on a single GPU thread, so it only pays
+    off for many small files; files above kernel_max_size are hashed on the CPU.
     """
 
     def __init__(
-        self, device_id: int = 0, batch_size: int = 10, chunk_size: int = 256 * 1024 * 1024
+        self,
+        device_id: int = 0,
+        batch_size: int = 1024,
+        chunk_size: int = 256 * 1024 * 1024,
+        num_streams: int = 3,
+        kernel_max_size: int = 1024 * 1024,
+        max_batch_bytes: int = 64 * 1024 * 1024,
+        cpu_processor: Optional[CPUHashProcessor] = None,
     ):
         """
         Initialize GPU hash processor.
 
         Args:
             device_id: GPU device ID
-            batch_size: Number of files to process in a batch
+            batch_size: Number of files per kernel launch (one GPU thread each)
             chunk_size: Chunk size for reading files (default: 256MB)
+            num_streams: CUDA streams used to overlap copies and kernels across batches
+            kernel_max_size: Largest file hashed by the batch kernel (default: 1MB);
+                larger files are hashed by the CPU thread pool
+            max_batch_bytes: Most file bytes per kernel launch (default: 64MB), which
+                bounds the pinned and device buffers of each in-flight batch
+            cpu_processor: CPU processor used for the 1KB stage, files above
+                kernel_max_size and fallbacks; its hash cache also stores kernel
+                hashes (default: a new CPUHashProcessor)
         """
         self.device_id = device_id
         self.batch_size = batch_size
         self.chunk_size = chunk_size
+        self.kernel_max_size = kernel_max_size
+        self.max_batch_bytes = max_batch_bytes
+        self.cpu_processor = cpu_processor if cpu_processor is not None else CPUHashProcessor()
         self.gpu_pool = GPUMemoryPool(device_id=device_id)
         self._gpu_available = self.gpu_pool._gpu_available
+        self._streams: List[Any] = []
 
         if self._gpu_available:
             try:
                 import cupy as cp
 
                 cp.cuda.Device(device_id).use()
+                self._streams = [cp.cuda.Stream(non_blocking=True) for _ in range(num_streams)]
             except (ImportError, RuntimeError):
                 self._gpu_available = False
 
@@ -50,10 +89,7 @@ class GPUHashProcessor(HashProcessor):
         Note: First 1KB is too small for GPU - uses CPU instead.
         """
         # First 1KB is too small for GPU, use CPU
-        from .cpu import CPUHashProcessor
-
-        cpu_processor = CPUHashProcessor()
-        return cpu_processor.hash_first_1k(file)
+        return self.cpu_processor.hash_first_1k(file)
 
     def hash_full_file(self, file: EbookFile) -> bytes:
         """
@@ -63,10 +99,7 @@ class GPUHashProcessor(HashProcessor):
         """
         if not self._gpu_available:
             # Fallback to CPU
-            from .cpu import CPUHashProcessor
-
-            cpu_processor = CPUHashProcessor()
-            return cpu_processor.hash_full_file(file)
+            return self.cpu_processor.hash_full_file(file)
 
         try:
             import cupy as cp
@@ -113,15 +146,15 @@ class GPUHashProcessor(HashProcessor):
 
         except (ImportError, RuntimeError, OSError):
             # GPU error or file error - fallback to CPU
-            from .cpu import CPUHashProcessor
-
-            cpu_processor = CPUHashProcessor()
-            return cpu_processor.hash_full_file(file)
+            return self.cpu_processor.hash_full_file(file)
 
     def hash_batch(self, files: List[EbookFile], stage: str) -> List[bytes]:
         """
         Hash a batch of files using GPU.
 
+        Only files up to kernel_max_size are sent to the batch kernel; larger
+        files are hashed by the CPU thread pool.
+
         Args:
             files: List of EbookFile objects to hash
             stage: Stage identifier ('1k' or 'full')
@@ -131,31 +164,268 @@ class GPUHashProcessor(HashProcessor):
         """
         if stage == "1k":
             # First 1KB is too small for GPU
-            from .cpu import CPUHashProcessor
-
-            cpu_processor = CPUHashProcessor()
-            return cpu_processor.hash_batch(files, stage)
+            return self.cpu_processor.hash_batch(files, stage)
 
         if not self._gpu_available:
             # Fallback to CPU
-            from .cpu import CPUHashProcessor
+            return self.cpu_processor.hash_batch(files, stage)
+
+        results: List[bytes] = [b""] * len(files)
+
+        # A single GPU thread hashing a large file is far slower than a CPU
+        # core, so large files go to the CPU thread pool instead of the kernel
+        kernel_indices = []
+        cpu_indices = []
+        for index, file in enumerate(files):
+            if file.file_size <= self.kernel_max_size:
+                kernel_indices.append(index)
+            else:
+                cpu_indices.append(index)
+        if cpu_indices:
+            cpu_hashes = self.cpu_processor.hash_batch([files[i] for i in cpu_indices], stage)
+            for index, hash_value in zip(cpu_indices, cpu_hashes):
+                results[index] = hash_value
+
+        # Reuse the CPU processor's hash cache, so a resumed run only sends
+        # changed files to the kernel
+        hash_cache = self.cpu_processor.hash_cache
+        if hash_cache is not None:
+            miss_indices = []
+            for index in kernel_indices:
+                cached = hash_cache.get(files[index].full_path_str, stage)
+                if cached is None:
+                    miss_indices.append(index)
+                else:
+                    results[index] = cached
+            kernel_indices = miss_indices
+        if not kernel_indices:
+            return results
+
+        kernel_files = [files[i] for i in kernel_indices]
+        # Stamp before hashing, so a file changed mid-hash is not cached as valid
+        stamps: List[Optional[Tuple[int, int]]] = [None] * len(kernel_files)
+        if hash_cache is not None:
+            stamps = [hash_cache.file_stamp(f.full_path_str) for f in kernel_files]
+        kernel_results = self._hash_kernel_batches(kernel_files)
+        for index, file, stamp, hash_value in zip(
+            kernel_indices, kernel_files, stamps, kernel_results
+        ):
+            results[index] = hash_value
+            if hash_cache is not None and hash_value and stamp is not None:
+                hash_cache.put(file.full_path_str, stage, hash_value, *stamp)
+        if hash_cache is not None:
+            hash_cache.save()
+        return results
+
+    def cleanup(self) -> None:
+        """
+        Release pooled device and pinned memory.
 
-            cpu_processor = CPUHashProcessor()
-            return cpu_processor.hash_batch(files, stage)
+        Buffers are kept between hash_batch calls so later batches reuse them;
+        call this once hashing is finished.
+        """
+        self.gpu_pool.cleanup()
+
+    def _split_batches(self, files: List[EbookFile]) -> List[Tuple[int, int]]:
+        """
+        Split files into consecutive kernel batches.
 
-        # Process files in batches to manage GPU memory
-        results = []
-        for i in range(0, len(files), self.batch_size):
-            batch = files[i : i + self.batch_size]
-            batch_results = []
+        A batch holds at most batch_size files and max_batch_bytes of file
+        data, except that a single file larger than max_batch_bytes gets a
+        batch of its own.
 
-            for file in batch:
-                try:
-                    hash_result = self.hash_full_file(file)
-                    batch_results.append(hash_result)
-                except Exception:
-                    batch_results.append(b"")
+        Args:
+            files: Files to hash
+
+        Returns:
+            List of (start, end) index ranges into files
+        """
+        batches = []
+        start = 0
+        batch_bytes = 0
+        for index, file in enumerate(files):
+            if index > start and (
+                index - start >= self.batch_size
+                or batch_bytes + file.file_size > self.max_batch_bytes
+            ):
+                batches.append((start, index))
+                start = index
+                batch_bytes = 0
+            batch_bytes += file.file_size
+        if start < len(files):
+            batches.append((start, len(files)))
+        return batches
+
+    def _hash_kernel_batches(self, files: List[EbookFile]) -> List[bytes]:
+        """
+        Hash small files with the batch kernel, one launch per _split_batches range.
 
-            results.extend(batch_results)
+        Args:
+            files: Files no larger than kernel_max_size
+
+        Returns:
+            List of hash bytes in same order as input files
+        """
+        # Batches are launched round-robin on the streams, so reading the next
+        # batch from disk and its host-to-device copy overlap with kernels
+        # still running
+        hash_full_file = self.hash_full_file
+        streams: List[Optional[Any]] = list(self._streams) or [None]
+        results: List[bytes] = [b""] * len(files)
+        in_flight: Deque[Tuple[int, List[EbookFile], Optional[_KernelLaunch]]] = deque()
+
+        def finish_oldest() -> None:
+            start, batch, launch = in_flight.popleft()
+            try:
+                if launch is None:
+                    raise RuntimeError("Batch kernel launch failed")
+                batch_results = self._collect_batch_kernel(launch)
+            except Exception:
+                # Kernel unavailable or failed - hash each file individually
+                batch_results = []
+                for file in batch:
+                    try:
+                        batch_results.append(hash_full_file(file))
+                    except Exception:
+                        batch_results.append(b"")
+            results[start : start + len(batch)] = batch_results
+
+        for batch_number, (start, end) in enumerate(self._split_batches(files)):
+            if len(in_flight) >= len(streams):
+                finish_oldest()
+            batch = files[start:end]
+            launch: Optional[_KernelLaunch]
+            try:
+                launch = self._launch_batch_kernel(batch, streams[batch_number % len(streams)])
+            except Exception:
+                launch = None
+            in_flight.append((start, batch, launch))
+
+        while in_flight:
+            finish_oldest()
 
         return results
+
+    def _launch_batch_kernel(self, batch: List[EbookFile], stream: Any) -> _KernelLaunch:
+        """
+        Queue one SHA-256 kernel launch for a batch of files on a stream.
+
+        Each GPU thread hashes one file, so throughput comes from hashing many
+        files concurrently; hash_batch only sends files up to kernel_max_size.
+        Host staging buffers are pinned so the copies run asynchronously.
+
+        Args:
+            batch: Files to hash
+            stream: CUDA stream to queue work on, or None for the current stream
+
+        Returns:
+            Launch handle to pass to _collect_batch_kernel
+        """
+        import cupy as cp
+        import numpy as np
+
+        from .kernels import SHA256_THREADS_PER_BLOCK, get_sha256_batch_kernel
+
+        launch = _KernelLaunch(results=[b""] * len(batch), kernel_indices=[], stream=stream)
+        expected_bytes = sum(file.file_size for file in batch)
+        if not self.gpu_pool.can_allocate(expected_bytes, 32 * len(batch)):
+            raise RuntimeError("Batch does not fit in GPU memory")
+
+        cp.cuda.Device(self.device_id).use()
+        # Buffers come from the pool so consecutive batches reuse allocations
+        host_data = self.gpu_pool.acquire(expected_bytes, pinned=True)
+        launch.buffers.append((host_data, True))
+
+        # Read each file straight into its slot of the pinned buffer, so the
+        # batch is held on the host once instead of as file bytes, a joined
+        # copy and the pinned copy
+        offsets: List[int] = []
+        lengths: List[int] = []
+        position = 0
+        host_view = memoryview(host_data)
+        for index, file in enumerate(batch):
+            try:
+                with open(file.full_path, "rb") as f:
+                    size = f.readinto(host_view[position : position + file.file_size])
+                    changed = size != file.file_size or f.read(1) != b""
+            except OSError:
+                # Unreadable file - leave empty hash
+                continue
+            if changed:
+                # File changed size since discovery - hash what is on disk now
+                launch.results[index] = self.hash_full_file(file)
+                continue
+            launch.kernel_indices.append(index)
+            offsets.append(position)
+            lengths.append(size)
+            position += size
+
+        if not launch.kernel_indices:
+            self._release_launch(launch)
+            return launch
+
+        launch.digest_size = 32 * len(launch.kernel_indices)
+        launch.host_digests = self.gpu_pool.acquire(launch.digest_size, pinned=True)
+        launch.buffers.append((launch.host_digests, True))
+        gpu_data = self.gpu_pool.acquire(position)
+        launch.buffers.append((gpu_data, False))
+        gpu_digests = self.gpu_pool.acquire(launch.digest_size)
+        launch.buffers.append((gpu_digests, False))
+        num_messages = len(launch.kernel_indices)
+        try:
+            num_blocks = (num_messages + SHA256_THREADS_PER_BLOCK - 1) // SHA256_THREADS_PER_BLOCK
+            with stream if stream is not None else cp.cuda.get_current_stream():
+                if position:
+                    gpu_data[:position].set(host_data[:position], stream=stream)
+                gpu_offsets = cp.asarray(np.array(offsets, dtype=np.uint64))
+                gpu_lengths = cp.asarray(np.array(lengths, dtype=np.uint64))
+                launch.keep_alive.extend([gpu_offsets, gpu_lengths])
+                get_sha256_batch_kernel()(
+                    (num_blocks,),
+                    (SHA256_THREADS_PER_BLOCK,),
+                    (gpu_data, gpu_offsets, gpu_lengths, gpu_digests, np.int32(num_messages)),
+                )
+                gpu_digests[: launch.digest_size].get(
+                    stream=stream, out=launch.host_digests[: launch.digest_size], blocking=False
+                )
+        except Exception:
+            self._release_launch(launch)
+            raise
+
+        return launch
+
+    def _collect_batch_kernel(self, launch: _KernelLaunch) -> List[bytes]:
+        """
+        Wait for a queued launch and return its hashes.
+
+        Args:
+            launch: Handle returned by _launch_batch_kernel
+
+        Returns:
+            List of hash bytes in same order as the batch's files
+        """
+        if launch.host_digests is None:
+            return launch.results
+
+        try:
+            if launch.stream is not None:
+                launch.stream.synchronize()
+            else:
+                import cupy as cp
+
+                cp.cuda.get_current_stream().synchronize()
+            digests = launch.host_digests[: launch.digest_size].tobytes()
+        finally:
+            self._release_launch(launch)
+
+        for position, index in enumerate(launch.kernel_indices):
+            launch.results[index] = digests[32 * position : 32 * (position + 1)]
+
+        return launch.results
+
+    def _release_launch(self, launch: _KernelLaunch) -> None:
+        """Return a launch's buffers to the pool."""
+        for buffer, pinned in launch.buffers:
+            self.gpu_pool.release(buffer, pinned=pinned)
+        launch.buffers.clear()
+        launch.keep_alive.clear()
@@ -0,0 +1,143 @@
+"""
+CUDA kernels for GPU hashing (compiled at runtime through CuPy).
+"""
+
+from typing import Any, Optional
+
+# One thread hashes one message. SHA-256 is sequential within a message, so the
+# parallelism comes from hashing many independent files at once.
+SHA256_BATCH_KERNEL_SOURCE = r"""
+__constant__ unsigned int SHA256_K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+__device__ __forceinline__ unsigned int sha256_rotr(unsigned int x, unsigned int n)
+{
+    return (x >> n) | (x << (32 - n));
+}
+
+__device__ void sha256_transform(unsigned int* state, const unsigned char* block)
+{
+    unsigned int w[64];
+    for (int i = 0; i < 16; ++i) {
+        w[i] = ((unsigned int)block[4 * i] << 24) | ((unsigned int)block[4 * i + 1] << 16)
+             | ((unsigned int)block[4 * i + 2] << 8) | (unsigned int)block[4 * i + 3];
+    }
+    for (int i = 16; i < 64; ++i) {
+        unsigned int s0 = sha256_rotr(w[i - 15], 7) ^ sha256_rotr(w[i - 15], 18) ^ (w[i - 15] >> 3);
+        unsigned int s1 = sha256_rotr(w[i - 2], 17) ^ sha256_rotr(w[i - 2], 19) ^ (w[i - 2] >> 10);
+        w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+    }
+
+    unsigned int a = state[0], b = state[1], c = state[2], d = state[3];
+    unsigned int e = state[4], f = state[5], g = state[6], h = state[7];
+    for (int i = 0; i < 64; ++i) {
+        unsigned int s1 = sha256_rotr(e, 6) ^ sha256_rotr(e, 11) ^ sha256_rotr(e, 25);
+        unsigned int ch = (e & f) ^ (~e & g);
+        unsigned int t1 = h + s1 + ch + SHA256_K[i] + w[i];
+        unsigned int s0 = sha256_rotr(a, 2) ^ sha256_rotr(a, 13) ^ sha256_rotr(a, 22);
+        unsigned int maj = (a & b) ^ (a & c) ^ (b & c);
+        unsigned int t2 = s0 + maj;
+        h = g;
+        g = f;
+        f = e;
+        e = d + t1;
+        d = c;
+        c = b;
+        b = a;
+        a = t1 + t2;
+    }
+
+    state[0] += a;
+    state[1] += b;
+    state[2] += c;
+    state[3] += d;
+    state[4] += e;
+    state[5] += f;
+    state[6] += g;
+    state[7] += h;
+}
+
+extern "C" __global__ void sha256_batch(
+    const unsigned char* data,
+    const unsigned long long* offsets,
+    const unsigned long long* lengths,
+    unsigned char* digests,
+    int num_messages)
+{
+    int idx = blockDim.x * blockIdx.x + threadIdx.x;
+    if (idx >= num_messages) {
+        return;
+    }
+
+    const unsigned char* message = data + offsets[idx];
+    unsigned long long length = lengths[idx];
+    unsigned int state[8] = {
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+        0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    };
+
+    unsigned long long full_blocks = length / 64;
+    for (unsigned long long block = 0; block < full_blocks; ++block) {
+        sha256_transform(state, message + block * 64);
+    }
+
+    // Padding: remaining bytes, a single 1 bit, zeros, then the 64-bit bit length
+    unsigned char tail[128];
+    unsigned int remaining = (unsigned int)(length % 64);
+    for (unsigned int i = 0; i < remaining; ++i) {
+        tail[i] = message[full_blocks * 64 + i];
+    }
+    tail[remaining] = 0x80;
+    unsigned int tail_length = remaining < 56 ? 64 : 128;
+    for (unsigned int i = remaining + 1; i < tail_length - 8; ++i) {
+        tail[i] = 0;
+    }
+    unsigned long long bit_length = length * 8;
+    for (int i = 0; i < 8; ++i) {
+        tail[tail_length - 1 - i] = (unsigned char)(bit_length >> (8 * i));
+    }
+    sha256_transform(state, tail);
+    if (tail_length == 128) {
+        sha256_transform(state, tail + 64);
+    }
+
+    unsigned char* digest = digests + (unsigned long long)idx * 32;
+    for (int i = 0; i < 8; ++i) {
+        digest[4 * i] = (unsigned char)(state[i] >> 24);
+        digest[4 * i + 1] = (unsigned char)(state[i] >> 16);
+        digest[4 * i + 2] = (unsigned char)(state[i] >> 8);
+        digest[4 * i + 3] = (unsigned char)state[i];
+    }
+}
+"""
+
+# Threads per block for the batch kernel
+SHA256_THREADS_PER_BLOCK = 128
+
+_sha256_kernel: Optional[Any] = None
+
+
+def get_sha256_batch_kernel() -> Any:
+    """
+    Get the compiled SHA-256 batch kernel, compiling it on first use.
+
+    Returns:
+        cupy.RawKernel for ``sha256_batch``
+
+    Raises:
+        ImportError: If CuPy is not installed
+    """
+    global _sha256_kernel
+    if _sha256_kernel is None:
+        import cupy as cp
+
+        _sha256_kernel = cp.RawKernel(SHA256_BATCH_KERNEL_SOURCE, "sha256_batch")
+    return _sha256_kernel
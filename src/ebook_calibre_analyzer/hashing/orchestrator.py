@@ -12,6 +12,10 @@ from ..models import EbookFile, FileCollection
 from ..preprocessing import preprocess_files
 from .base import HashProcessor
 
+# Bytes covered by the Stage 2 hash. For files no larger than this the 1KB hash
+# already is the full-file hash.
+_FIRST_1K_SIZE = 1024
+
 
 class HashingOrchestrator:
     """
@@ -54,12 +58,12 @@ class HashingOrchestrator:
         Returns:
             Tuple of (calibre_candidates, ebooks_candidates) that were hashed
         """
-        # Find Calibre files that match sizes (for comparison)
-        stage2_sizes = {f.get_size_hash() for f in stage2_candidates}
+        # Find Calibre files that match sizes (for comparison) via the size index,
+        # so only size buckets shared by both collections are touched
+        stage2_sizes = dict.fromkeys(f.get_size_hash() for f in stage2_candidates)
         calibre_stage2_candidates = []
-        for file in self.calibre_collection.files:
-            if file.get_size_hash() in stage2_sizes:
-                calibre_stage2_candidates.append(file)
+        for size in stage2_sizes:
+            calibre_stage2_candidates.extend(self.calibre_collection.get_files_by_size(size))
 
         # Hash Calibre files first (1KB only) - always use CPU for 1KB
         if calibre_stage2_candidates:
@@ -86,6 +90,27 @@ class HashingOrchestrator:
 
         return calibre_stage2_candidates, stage2_candidates
 
+    @staticmethod
+    def _reuse_1k_hashes(files: List[EbookFile], collection: FileCollection) -> List[EbookFile]:
+        """
+        Copy the 1KB hash to full_hash for files the 1KB hash fully covers.
+
+        Args:
+            files: Stage 3 candidates
+            collection: Collection whose full-hash index should be updated
+
+        Returns:
+            Files that still need a full hash
+        """
+        remaining = []
+        for file in files:
+            if file.first_1k_hash and file.file_size <= _FIRST_1K_SIZE:
+                file.full_hash = file.first_1k_hash
+                collection.by_full_hash[file.full_hash] = file
+            else:
+                remaining.append(file)
+        return remaining
+
     def hash_stage3_files(
         self,
         stage3_candidates: List[EbookFile],
@@ -105,38 +130,40 @@ class HashingOrchestrator:
         Returns:
             Tuple of (calibre_candidates, ebooks_candidates) that were hashed
         """
+        # Small files were read completely in Stage 2 - don't open them again
+        ebooks_to_hash = self._reuse_1k_hashes(stage3_candidates, self.ebooks_collection)
+
         # Split ebooks candidates by processing method (GPU/CPU)
         stage3_gpu_files = [
             f
-            for f in stage3_candidates
+            for f in ebooks_to_hash
             if f.processing_method == "gpu" and self.gpu_processor is not None
         ]
         stage3_cpu_files = [
-            f
-            for f in stage3_candidates
-            if f.processing_method == "cpu" or self.gpu_processor is None
+            f for f in ebooks_to_hash if f.processing_method == "cpu" or self.gpu_processor is None
         ]
 
         logger.info(f"  GPU candidates: {len(stage3_gpu_files)}")
         logger.info(f"  CPU candidates: {len(stage3_cpu_files)}")
 
         # Find Calibre files that match size and 1KB hash
-        stage3_size_1k_set = {
+        stage3_size_1k_keys = dict.fromkeys(
             (f.get_size_hash(), f.first_1k_hash)
             for f in stage3_candidates
             if f.first_1k_hash is not None
-        }
+        )
         calibre_stage3_candidates = []
-        for file in self.calibre_collection.files:
-            if (
-                file.first_1k_hash is not None
-                and (file.get_size_hash(), file.first_1k_hash) in stage3_size_1k_set
-            ):
-                calibre_stage3_candidates.append(file)
+        seen_ids = set()
+        for size, hash_1k in stage3_size_1k_keys:
+            for file in self.calibre_collection.get_files_by_size_and_1k(size, hash_1k):
+                # A file can be indexed twice if it was re-hashed after being added
+                if id(file) not in seen_ids:
+                    seen_ids.add(id(file))
+                    calibre_stage3_candidates.append(file)
 
         # Preprocess Calibre files for GPU/CPU selection
         calibre_categorized = preprocess_files(
-            calibre_stage3_candidates,
+            self._reuse_1k_hashes(calibre_stage3_candidates, self.calibre_collection),
             gpu_available=gpu_available,
             gpu_threshold=gpu_threshold,
             processed_files=processed_files or set(),
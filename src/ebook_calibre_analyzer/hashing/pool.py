@@ -2,7 +2,7 @@
 GPU memory pool manager for handling large file hashing.
 """
 
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 class GPUMemoryPool:
@@ -12,19 +12,33 @@ class GPUMemoryPool:
     Handles chunked processing for files that don't fit in GPU memory.
     """
 
-    def __init__(self, device_id: int = 0, max_file_size: int = 500_000_000_000):
+    def __init__(
+        self,
+        device_id: int = 0,
+        max_file_size: int = 500_000_000_000,
+        max_free_bytes: int = 256 * 1024 * 1024,
+    ):
         """
         Initialize GPU memory pool.
 
         Args:
             device_id: GPU device ID
             max_file_size: Maximum file size to handle (default: 500GB)
+            max_free_bytes: Most bytes of released buffers kept for reuse, per
+                memory kind (device and pinned host); extra buffers are freed
         """
         self.device_id = device_id
         self.max_file_size = max_file_size
+        self.max_free_bytes = max_free_bytes
         self.total_memory: Optional[int] = None
         self.available_memory: Optional[int] = None
         self.allocated_buffers: Dict[str, any] = {}  # file_id -> GPU buffer
+        # Released device buffers, keyed by power-of-two capacity in bytes
+        self._free_buckets: Dict[int, List[Any]] = {}
+        # Released pinned host buffers, keyed the same way
+        self._free_pinned_buckets: Dict[int, List[Any]] = {}
+        # Bytes currently held in the free buckets, keyed by pinned flag
+        self._free_bytes: Dict[bool, int] = {False: 0, True: 0}
         self._gpu_available = False
         self._error_reason: Optional[str] = None
 
@@ -60,12 +74,15 @@ class GPUMemoryPool:
             self.available_memory = None
             self._error_reason = f"Unexpected error: {e}"
 
-    def can_allocate(self, size: int) -> bool:
+    def can_allocate(self, *sizes: int) -> bool:
         """
-        Check if we can allocate the requested size.
+        Check if device buffers of the requested sizes can be acquired.
+
+        Each size is rounded up to its bucket, as acquire() would, and sizes
+        that a pooled free buffer can satisfy need no new memory.
 
         Args:
-            size: Size in bytes to allocate
+            sizes: Sizes in bytes of the device buffers to acquire
 
         Returns:
             True if allocation is possible
@@ -73,10 +90,19 @@ class GPUMemoryPool:
         if not self._gpu_available:
             return False
 
+        needed = 0
+        reusable = {capacity: len(bucket) for capacity, bucket in self._free_buckets.items()}
+        for size in sizes:
+            capacity = self.bucket_size(size)
+            if reusable.get(capacity):
+                reusable[capacity] -= 1
+            else:
+                needed += capacity
+
         # Reserve 10% of available memory for other operations
         available = self.get_available_memory()
         reserved = int(available * 0.1)
-        return size <= (available - reserved)
+        return needed <= (available - reserved)
 
     def get_available_memory(self) -> int:
         """
@@ -98,15 +124,84 @@ class GPUMemoryPool:
         except (ImportError, RuntimeError):
             return 0
 
+    @staticmethod
+    def bucket_size(size: int) -> int:
+        """
+        Round a requested size up to its power-of-two bucket.
+
+        Args:
+            size: Size in bytes
+
+        Returns:
+            Bucket capacity in bytes
+        """
+        if size <= 1:
+            return 1
+        return 1 << (size - 1).bit_length()
+
+    def acquire(self, size: int, pinned: bool = False) -> Any:
+        """
+        Get a buffer of at least ``size`` bytes, reusing a released one if possible.
+
+        Reusing buffers avoids a cudaMalloc/cudaFree (or cudaHostAlloc) pair per batch.
+
+        Args:
+            size: Minimum size in bytes
+            pinned: Return page-locked host memory instead of device memory
+
+        Returns:
+            uint8 array whose length is the bucket capacity: a cupy array on the
+            device, or a numpy array in pinned host memory
+
+        Raises:
+            ImportError: If CuPy is not installed and no buffer can be reused
+        """
+        capacity = self.bucket_size(size)
+        buckets = self._free_pinned_buckets if pinned else self._free_buckets
+        bucket = buckets.get(capacity)
+        if bucket:
+            self._free_bytes[pinned] -= capacity
+            return bucket.pop()
+
+        if pinned:
+            import cupyx
+            import numpy as np
+
+            return cupyx.empty_pinned(capacity, dtype=np.uint8)
+
+        import cupy as cp
+
+        return cp.empty(capacity, dtype=cp.uint8)
+
+    def release(self, buffer: Any, pinned: bool = False) -> None:
+        """
+        Return a buffer obtained from acquire() for reuse.
+
+        Args:
+            buffer: Buffer previously returned by acquire()
+            pinned: Whether the buffer was acquired as pinned host memory
+        """
+        # Past the limit the buffer is dropped, so CuPy can free its memory
+        if self._free_bytes[pinned] + buffer.nbytes > self.max_free_bytes:
+            return
+        buckets = self._free_pinned_buckets if pinned else self._free_buckets
+        buckets.setdefault(buffer.nbytes, []).append(buffer)
+        self._free_bytes[pinned] += buffer.nbytes
+
     def cleanup(self) -> None:
         """Release all allocated buffers."""
+        # Drop pooled buffers first so free_all_blocks can return their memory
+        self._free_buckets.clear()
+        self._free_pinned_buckets.clear()
+        self._free_bytes = {False: 0, True: 0}
         if self._gpu_available:
             try:
                 import cupy as cp
 
-                # Clear memory pool
+                # Clear memory pools
                 mempool = cp.get_default_memory_pool()
                 mempool.free_all_blocks()
+                cp.get_default_pinned_memory_pool().free_all_blocks()
             except (ImportError, RuntimeError):
                 pass
 
@@ -2,10 +2,11 @@
 OOP classes for ebook file representation and collections.
 """
 
+import os
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 
 @dataclass
@@ -25,6 +26,30 @@ class EbookFile:
         "pending"  # 'pending' | 'size_checked' | '1k_hashed' | 'full_hashed' | 'error'
     )
     error_message: Optional[str] = None
+    # Cached string forms of the paths, cleared when a path is reassigned
+    _full_path_str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _relative_path_str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "full_path":
+            super().__setattr__("_full_path_str", None)
+        elif name == "relative_path":
+            super().__setattr__("_relative_path_str", None)
+
+    @property
+    def full_path_str(self) -> str:
+        """String form of full_path, cached so hot loops skip Path.__str__."""
+        if self._full_path_str is None:
+            self._full_path_str = os.fspath(self.full_path)
+        return self._full_path_str
+
+    @property
+    def relative_path_str(self) -> str:
+        """String form of relative_path, cached so hot loops skip Path.__str__."""
+        if self._relative_path_str is None:
+            self._relative_path_str = os.fspath(self.relative_path)
+        return self._relative_path_str
 
     def get_size_hash(self) -> int:
         """Get file size (used as hash for Stage 1)."""
@@ -35,10 +60,10 @@ class EbookFile:
     def to_dict(self) -> dict:
         """Convert to dictionary for CSV serialization."""
         return {
-            "relative_path": str(self.relative_path),
+            "relative_path": self.relative_path_str,
             "filename": self.filename,
             "file_size": self.file_size,
-            "full_path": str(self.full_path),
+            "full_path": self.full_path_str,
         }
 
     @classmethod
@@ -77,6 +102,24 @@ class FileCollection:
         if file.full_hash is not None:
             self.by_full_hash[file.full_hash] = file
 
+    def extend(self, files: Iterable[EbookFile]) -> None:
+        """Add many files to the collection, equivalent to add_file for each."""
+        new_files = list(files)
+        self.files.extend(new_files)
+
+        # Bind the indexes once instead of looking them up per file
+        by_size = self.by_size
+        by_size_and_1k = self.by_size_and_1k
+        for file in new_files:
+            size = file.get_size_hash()
+            by_size[size].append(file)
+            if file.first_1k_hash is not None:
+                by_size_and_1k[(size, file.first_1k_hash)].append(file)
+
+        self.by_full_hash.update(
+            (file.full_hash, file) for file in new_files if file.full_hash is not None
+        )
+
     def get_files_by_size(self, size: int) -> List[EbookFile]:
         """Get all files with the given size."""
         return self.by_size.get(size, [])
@@ -10,7 +10,7 @@ from .models import EbookFile
 def preprocess_files(
     files: List[EbookFile],
     gpu_available: bool = False,
-    gpu_threshold: Optional[int] = None,  # 100MB default, None if GPU not available
+    gpu_threshold: Optional[int] = None,  # 1MB default, None if GPU not available
     processed_files: Optional[set] = None,
 ) -> Dict[str, List[EbookFile]]:
     """
@@ -19,8 +19,9 @@ def preprocess_files(
     Args:
         files: List of EbookFile objects to categorize
         gpu_available: Whether GPU is available
-        gpu_threshold: File size threshold for GPU processing (bytes).
-                      If None, defaults to 100MB when GPU is available.
+        gpu_threshold: Largest file size hashed on the GPU (bytes). The batch
+                      kernel hashes many small files at once; larger files stay
+                      on the CPU. If None, defaults to 1MB when GPU is available.
         processed_files: Set of file paths already processed (for resume mode)
 
     Returns:
@@ -34,19 +35,19 @@ def preprocess_files(
 
     # Default threshold if not provided and GPU is available
     if gpu_threshold is None and gpu_available:
-        gpu_threshold = 100 * 1024 * 1024  # 100MB default
+        gpu_threshold = 1024 * 1024  # 1MB default
 
     categorized = {"gpu": [], "cpu": [], "skip": []}
 
     for file in files:
         # Skip if already processed (resume mode)
-        if str(file.full_path) in processed_files:
+        if file.full_path_str in processed_files:
             categorized["skip"].append(file)
             continue
 
         # Determine processing method
-        # Only use GPU if available, threshold is set, and file is large enough
-        if gpu_available and gpu_threshold is not None and file.file_size >= gpu_threshold:
+        # Only use GPU if available, threshold is set, and file is small enough
+        if gpu_available and gpu_threshold is not None and file.file_size <= gpu_threshold:
             file.processing_method = "gpu"
             categorized["gpu"].append(file)
         else:
@@ -46,6 +46,7 @@ class TestCreateAnalyzeParser:
                 "epub",
                 "--resume",
                 "resume.csv",
+                "--hash-cache",
                 "--use-gpu",
                 "--gpu-device",
                 "1",
@@ -60,6 +61,7 @@ class TestCreateAnalyzeParser:
         assert args.output is not None
         assert args.file_types is not None
         assert args.resume is not None
+        assert args.hash_cache is True
         assert args.use_gpu is True
         assert args.gpu_device == 1
         assert args.gpu_threshold == "200MB"
@@ -76,8 +78,9 @@ class TestCreateAnalyzeParser:
         assert args.output is None
         assert args.file_types is None
         assert args.resume is None
+        assert args.hash_cache is False
         assert args.use_gpu is False
         assert args.gpu_device == 0
-        assert args.gpu_threshold == "100MB"
+        assert args.gpu_threshold == "1MB"
         assert args.batch_size == 100
         assert args.workers == 10
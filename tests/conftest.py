@@ -2,13 +2,16 @@
 Shared pytest fixtures and configuration for all tests.
 """
 
+import os
+import shutil
 import tempfile
 from pathlib import Path
-from typing import Generator
+from typing import Callable, Generator
 
 import pytest
 
 from ebook_calibre_analyzer.models import EbookFile
+from tests.helpers import CANONICAL_TREE_EXTENSIONS, CANONICAL_TREE_SIZE, CANONICAL_TREE_SUBDIRS
 
 
 @pytest.fixture
@@ -18,6 +21,57 @@ def temp_dir() -> Generator[Path, None, None]:
         yield Path(tmpdir)
 
 
+@pytest.fixture(scope="session")
+def empty_dirs(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Provide empty ``ebooks`` and ``calibre`` folders, created once per session.
+
+    For tests that only pass the folders along; tests must not write into them.
+    """
+    base = tmp_path_factory.mktemp("empty")
+    (base / "ebooks").mkdir()
+    (base / "calibre").mkdir()
+    return base
+
+
+@pytest.fixture
+def fake_fs() -> Generator[Path, None, None]:
+    """
+    Provide a directory on an in-memory filesystem (pyfakefs).
+
+    For tests that only check logic, not on-disk behaviour. Everything the test
+    touches, including ``tempfile`` and ``open``, goes to the fake filesystem.
+    """
+    fake_filesystem_unittest = pytest.importorskip("pyfakefs.fake_filesystem_unittest")
+    with fake_filesystem_unittest.Patcher() as patcher:
+        root = Path("/fake")
+        patcher.fs.create_dir(root)
+        yield root
+
+
+@pytest.fixture(scope="session")
+def ebook_file_factory() -> Callable[..., EbookFile]:
+    """
+    Build EbookFile objects without touching the filesystem.
+
+    Call as ``ebook_file_factory(directory, name="test.pdf", size=100, **overrides)``;
+    ``name`` may include subdirectories and becomes the relative path.
+    """
+
+    def make(directory: Path, name: str = "test.pdf", size: int = 100, **overrides) -> EbookFile:
+        relative_path = Path(name)
+        return EbookFile(
+            full_path=directory / relative_path,
+            relative_path=relative_path,
+            filename=relative_path.name,
+            file_size=size,
+            file_extension=relative_path.suffix,
+            **overrides,
+        )
+
+    return make
+
+
 @pytest.fixture
 def sample_ebook_file(temp_dir: Path) -> EbookFile:
     """Create a sample EbookFile for testing."""
@@ -53,3 +107,40 @@ def sample_ebook_files(temp_dir: Path) -> list[EbookFile]:
         )
 
     return files
+
+
+@pytest.fixture(scope="session")
+def canonical_ebook_tree(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Build a nested tree of ebook files once per test session.
+
+    The tree holds CANONICAL_TREE_SIZE files with unique filenames spread across
+    nested subdirectories. Tests must treat it as read-only; use ``ebook_tree``
+    to get a per-test view of it.
+    """
+    root = tmp_path_factory.mktemp("canonical_ebooks")
+    for subdir in CANONICAL_TREE_SUBDIRS:
+        (root / subdir).mkdir(parents=True, exist_ok=True)
+
+    for i in range(CANONICAL_TREE_SIZE):
+        subdir = CANONICAL_TREE_SUBDIRS[i % len(CANONICAL_TREE_SUBDIRS)]
+        ext = CANONICAL_TREE_EXTENSIONS[i % len(CANONICAL_TREE_EXTENSIONS)]
+        (root / subdir / f"book_{i:03d}{ext}").write_bytes(f"content {i}".encode())
+
+    return root
+
+
+@pytest.fixture
+def ebook_tree(canonical_ebook_tree: Path, temp_dir: Path) -> Path:
+    """
+    Expose the canonical ebook tree as ``temp_dir / "src"``.
+
+    Uses a symlink so no files are recreated per test, falling back to a copy
+    on platforms where symlinks are unavailable.
+    """
+    src = temp_dir / "src"
+    try:
+        os.symlink(canonical_ebook_tree, src, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        shutil.copytree(canonical_ebook_tree, src)
+    return src
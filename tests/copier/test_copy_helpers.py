@@ -0,0 +1,143 @@
+"""
+Tests for copier helper functions.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ebook_calibre_analyzer import copier
+from ebook_calibre_analyzer.copier import _copy_fd_data, _copy_file
+
+
+def _copy_with_fds(source, target):
+    src_fd = os.open(source, os.O_RDONLY)
+    dst_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _copy_fd_data(src_fd, dst_fd)
+    finally:
+        os.close(src_fd)
+        os.close(dst_fd)
+
+
+class TestCopyFdData:
+    """Test cases for _copy_fd_data function."""
+
+    def test_copies_contents(self, temp_dir):
+        """Test that _copy_fd_data copies the whole file."""
+        source = temp_dir / "source.pdf"
+        target = temp_dir / "target.pdf"
+        content = os.urandom(3 * 1024 * 1024 + 5)
+        source.write_bytes(content)
+
+        _copy_with_fds(source, target)
+        assert target.read_bytes() == content
+
+    def test_falls_back_when_kernel_copies_unsupported(self, temp_dir):
+        """Test that _copy_fd_data uses the buffered loop when kernel copies are refused."""
+        source = temp_dir / "source.pdf"
+        target = temp_dir / "target.pdf"
+        content = os.urandom(2 * 1024 * 1024 + 17)
+        source.write_bytes(content)
+
+        unsupported = OSError(errno.ENOSYS, "not supported")
+        with patch(
+            "ebook_calibre_analyzer.copier.os.copy_file_range",
+            side_effect=unsupported,
+            create=True,
+        ), patch("ebook_calibre_analyzer.copier.os.sendfile", side_effect=unsupported):
+            _copy_with_fds(source, target)
+        assert target.read_bytes() == content
+
+    def test_reuses_one_buffer_per_thread(self):
+        """Test that the fallback buffer is allocated once per thread."""
+        buffer = copier._get_copy_buffer()
+        assert copier._get_copy_buffer() is buffer
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(copier._get_copy_buffer()))
+        thread.start()
+        thread.join()
+        assert other[0] is not buffer
+        assert len(other[0]) == len(buffer)
+
+    def test_propagates_real_io_errors(self, temp_dir):
+        """Test that _copy_fd_data does not mask I/O errors as unsupported."""
+        source = temp_dir / "source.pdf"
+        target = temp_dir / "target.pdf"
+        source.write_bytes(b"content")
+
+        with patch(
+            "ebook_calibre_analyzer.copier.os.copy_file_range",
+            side_effect=OSError(errno.EIO, "I/O error"),
+            create=True,
+        ), pytest.raises(OSError):
+            _copy_with_fds(source, target)
+
+
+class TestCopyFile:
+    """Test cases for _copy_file function."""
+
+    def test_preserves_contents_and_metadata(self, temp_dir):
+        """Test that _copy_file copies data, permissions and modification time."""
+        source = temp_dir / "source.pdf"
+        target = temp_dir / "target.pdf"
+        source.write_bytes(b"book content")
+        os.chmod(source, 0o640)
+        os.utime(source, (1_000_000_000, 1_000_000_000))
+
+        _copy_file(str(source), str(target))
+
+        assert target.read_bytes() == b"book content"
+        assert target.stat().st_mode == source.stat().st_mode
+        assert target.stat().st_mtime == source.stat().st_mtime
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="FICLONE is Linux-only")
+    def test_remembers_filesystems_without_reflink(self, temp_dir, monkeypatch):
+        """Test that _copy_file tries FICLONE once per filesystem pair after it fails."""
+        monkeypatch.setattr(copier, "_reflink_unsupported", set())
+        source = temp_dir / "source.pdf"
+        source.write_bytes(b"book content")
+
+        with patch(
+            "fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "not supported")
+        ) as mock_ioctl:
+            _copy_file(str(source), str(temp_dir / "first.pdf"))
+            _copy_file(str(source), str(temp_dir / "second.pdf"))
+
+        assert mock_ioctl.call_count == 1
+        assert (temp_dir / "first.pdf").read_bytes() == b"book content"
+        assert (temp_dir / "second.pdf").read_bytes() == b"book content"
+
+    @pytest.mark.parametrize("link", [False, True], ids=["same_path", "hardlink"])
+    def test_refuses_to_copy_onto_source(self, temp_dir, link):
+        """Test that _copy_file raises SameFileError instead of truncating the source."""
+        source = temp_dir / "source.pdf"
+        source.write_bytes(b"book content")
+        target = source
+        if link:
+            target = temp_dir / "link.pdf"
+            os.link(source, target)
+
+        with pytest.raises(shutil.SameFileError):
+            _copy_file(str(source), str(target))
+        assert source.read_bytes() == b"book content"
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux copy path only")
+    def test_raises_on_short_copy(self, temp_dir):
+        """Test that _copy_file fails when fewer bytes reach the target than the source holds."""
+        source = temp_dir / "source.pdf"
+        source.write_bytes(b"book content")
+
+        def partial_copy(src_fd, dst_fd):
+            os.write(dst_fd, b"book")
+
+        with patch.object(copier, "_try_reflink", return_value=False), patch.object(
+            copier, "_copy_fd_data", side_effect=partial_copy
+        ), pytest.raises(OSError, match="Short copy"):
+            _copy_file(str(source), str(temp_dir / "target.pdf"))
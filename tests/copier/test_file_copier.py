@@ -3,12 +3,15 @@ Tests for FileCopier class.
 """
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from ebook_calibre_analyzer.copier import FileCopier
 from ebook_calibre_analyzer.csv_handler import CSVHandler
+from ebook_calibre_analyzer.discovery import discover_files_recursive
 from ebook_calibre_analyzer.models import EbookFile
+from tests.helpers import CANONICAL_TREE_EXTENSIONS, CANONICAL_TREE_SIZE
 
 
 class TestFileCopier:
@@ -157,36 +160,25 @@ class TestFileCopier:
         assert "Would copy" in result["message"]
         assert not (target / "book.pdf").exists()  # File not actually copied
 
-    def test_copy_all_copies_all_files(self, temp_dir):
+    def test_copy_all_copies_all_files(self, temp_dir, ebook_tree):
         """Test that copy_all copies all files from CSV."""
         csv_path = temp_dir / "test.csv"
-        source = temp_dir / "source"
         target = temp_dir / "target"
-        source.mkdir()
 
-        # Create CSV
+        # Create CSV from the shared ebook tree
+        files = discover_files_recursive(ebook_tree, list(CANONICAL_TREE_EXTENSIONS))
         handler = CSVHandler(csv_path)
-        files = []
-        for i in range(3):
-            source_file = source / f"file{i}.pdf"
-            source_file.write_bytes(f"content{i}".encode())
-            file = EbookFile(
-                full_path=source_file,
-                relative_path=Path(f"file{i}.pdf"),
-                filename=f"file{i}.pdf",
-                file_size=len(f"content{i}".encode()),
-                file_extension=".pdf",
-            )
-            files.append(file)
         handler.write_batch(files)
         handler.flush()
 
-        copier = FileCopier(csv_path, source, target)
+        copier = FileCopier(csv_path, ebook_tree, target)
         stats = copier.copy_all()
 
-        assert stats["total"] == 3
-        assert stats["success"] == 3
-        assert len(stats["results"]) == 3
+        assert stats["total"] == CANONICAL_TREE_SIZE
+        assert stats["success"] == CANONICAL_TREE_SIZE
+        assert len(stats["results"]) == CANONICAL_TREE_SIZE
+        # Flat structure: every file lands directly in the target root
+        assert len(list(target.iterdir())) == CANONICAL_TREE_SIZE
 
     def test_copy_all_returns_correct_statistics(self, temp_dir):
         """Test that copy_all returns correct statistics (total, success, failed, skipped)."""
@@ -251,14 +243,12 @@ class TestFileCopier:
             file_extension=".pdf",
         )
 
-        # Mock shutil.copy2 to raise an exception
-        from unittest.mock import patch
-
-        with patch("ebook_calibre_analyzer.copier.shutil.copy2") as mock_copy:
+        # Mock the copy helper to raise an exception
+        with patch("ebook_calibre_analyzer.copier._copy_file") as mock_copy:
             mock_copy.side_effect = OSError("Permission denied")
             result = copier.copy_file(file)
             assert result["success"] is False
-            assert "Error copying" in result["message"]
+            assert "Filesystem error copying file" in result["message"]
 
     def test_resolve_filename_conflict_fallback_loop(self, temp_dir):
         """Test that _resolve_filename_conflict uses fallback counter when random attempts fail."""
@@ -272,8 +262,6 @@ class TestFileCopier:
         (target / "book.pdf").write_bytes(b"existing")
 
         # Mock generate_random_suffix to always return the same value to force fallback
-        from unittest.mock import patch
-
         # Create 100 files with the same random suffix pattern to exhaust random attempts
         # Then the fallback counter should kick in
         with patch("ebook_calibre_analyzer.copier.generate_random_suffix") as mock_suffix:
@@ -332,3 +320,62 @@ class TestFileCopier:
         assert stats["total"] == 1
         assert stats["skipped"] == 1
         assert stats["success"] == 0
+
+    def test_copy_all_concurrent_handles_duplicate_filenames(self, temp_dir):
+        """Test that concurrent copy_all renames duplicates and keeps results in CSV order."""
+        csv_path = temp_dir / "test.csv"
+        source = temp_dir / "source"
+        target = temp_dir / "target"
+
+        files = []
+        for i in range(12):
+            subdir = source / f"dir{i % 3}"
+            subdir.mkdir(parents=True, exist_ok=True)
+            source_file = subdir / f"book{i // 3}.pdf"
+            source_file.write_bytes(f"content {i}".encode())
+            files.append(
+                EbookFile(
+                    full_path=source_file,
+                    relative_path=source_file.relative_to(source),
+                    filename=source_file.name,
+                    file_size=source_file.stat().st_size,
+                    file_extension=".pdf",
+                )
+            )
+        handler = CSVHandler(csv_path)
+        handler.write_batch(files)
+        handler.close()
+
+        copier = FileCopier(csv_path, source, target, conflict_handling="rename", num_workers=4)
+        stats = copier.copy_all()
+
+        assert stats["success"] == 12
+        assert [r["source"] for r in stats["results"]] == [str(f.full_path) for f in files]
+        copied = sorted(path.read_bytes() for path in target.iterdir())
+        assert copied == sorted(f"content {i}".encode() for i in range(12))
+
+    def test_copy_file_creates_target_directory_once(self, temp_dir):
+        """Test that copy_file only creates the target directory for the first file."""
+        source = temp_dir / "source"
+        target = temp_dir / "new_target"
+        source.mkdir()
+        copier = FileCopier(temp_dir / "test.csv", source, target)
+
+        files = []
+        for name in ["a.pdf", "b.pdf"]:
+            (source / name).write_bytes(b"content")
+            files.append(
+                EbookFile(
+                    full_path=source / name,
+                    relative_path=Path(name),
+                    filename=name,
+                    file_size=len(b"content"),
+                    file_extension=".pdf",
+                )
+            )
+
+        with patch.object(Path, "mkdir", autospec=True, side_effect=Path.mkdir) as mkdir:
+            results = [copier.copy_file(file) for file in files]
+
+        assert all(result["success"] for result in results)
+        assert mkdir.call_count == 1
@@ -3,8 +3,11 @@ Tests for CSVHandler class.
 """
 
 import csv
+import io
 from pathlib import Path
 
+import pytest
+
 from ebook_calibre_analyzer.csv_handler import CSVHandler
 from ebook_calibre_analyzer.models import EbookFile
 
@@ -43,6 +46,7 @@ class TestCSVHandler:
         # Create new handler in resume mode
         handler2 = CSVHandler(csv_path, resume_mode=True)
         assert str(file1.full_path) in handler2._processed_files
+        assert handler2.processed_files is handler2._processed_files
 
     def test_write_header_writes_to_new_file(self, temp_dir):
         """Test that write_header writes header to new file."""
@@ -74,6 +78,58 @@ class TestCSVHandler:
         handler.write_header()
         assert csv_path.stat().st_size == original_size
 
+    def test_resume_appends_without_duplicate_header(self, temp_dir):
+        """Test that a resumed handler appends rows to an existing CSV without a second header."""
+        csv_path = temp_dir / "test.csv"
+        files = [
+            EbookFile(
+                full_path=temp_dir / f"file{i}.pdf",
+                relative_path=Path(f"file{i}.pdf"),
+                filename=f"file{i}.pdf",
+                file_size=100,
+                file_extension=".pdf",
+            )
+            for i in range(2)
+        ]
+        with CSVHandler(csv_path) as handler:
+            handler.write_batch([files[0]])
+
+        with CSVHandler(csv_path, resume_mode=True) as resumed:
+            assert resumed._processed_files == {str(files[0].full_path)}
+            resumed.write_batch([files[1]])
+
+        lines = csv_path.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == ",".join(CSVHandler.FIELDS)
+        assert len(lines) == 3
+
+    @pytest.mark.parametrize("tail_chunk_size", [64 * 1024, 4], ids=["one_chunk", "many_chunks"])
+    def test_resume_drops_partial_last_row(self, temp_dir, monkeypatch, tail_chunk_size):
+        """Test that a resumed handler drops an unterminated last row before appending."""
+        monkeypatch.setattr(CSVHandler, "_TAIL_CHUNK_SIZE", tail_chunk_size)
+        csv_path = temp_dir / "test.csv"
+        files = [
+            EbookFile(
+                full_path=temp_dir / f"file{i}.pdf",
+                relative_path=Path(f"file{i}.pdf"),
+                filename=f"file{i}.pdf",
+                file_size=100,
+                file_extension=".pdf",
+            )
+            for i in range(2)
+        ]
+        with CSVHandler(csv_path) as handler:
+            handler.write_batch(files)
+        # Simulate a run interrupted partway through writing the last row
+        content = csv_path.read_bytes()
+        csv_path.write_bytes(content[:-10])
+
+        with CSVHandler(csv_path, resume_mode=True) as resumed:
+            assert resumed._processed_files == {str(files[0].full_path)}
+            resumed.write_batch([files[1]])
+
+        rows = resumed.read_all(temp_dir)
+        assert [row.full_path for row in rows] == [f.full_path for f in files]
+
     def test_write_batch_adds_to_buffer(self, temp_dir):
         """Test that write_batch adds files to buffer."""
         csv_path = temp_dir / "test.csv"
@@ -196,6 +252,29 @@ class TestCSVHandler:
         assert len(processed) == 3
         assert all(str(f.full_path) in processed for f in files)
 
+    def test_get_processed_files_handles_quoted_rows(self, temp_dir):
+        """Test that get_processed_files matches csv.DictReader on quoted and plain rows."""
+        csv_path = temp_dir / "test.csv"
+        names = ["plain.pdf", "comma, title.pdf", "line\nbreak.pdf", "after.pdf"]
+        files = [
+            EbookFile(
+                full_path=temp_dir / name,
+                relative_path=Path(name),
+                filename=name,
+                file_size=100,
+                file_extension=".pdf",
+            )
+            for name in names
+        ]
+
+        with CSVHandler(csv_path) as handler:
+            handler.write_batch(files)
+
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            expected = {row["full_path"] for row in csv.DictReader(f)}
+        assert handler.get_processed_files() == expected
+        assert expected == {str(f.full_path) for f in files}
+
     def test_write_batch_handles_empty_list(self, temp_dir):
         """Test that write_batch handles empty files list."""
         csv_path = temp_dir / "test.csv"
@@ -257,3 +336,80 @@ class TestCSVHandler:
         handler.flush()
 
         assert handler.get_last_processed_index() == 3
+
+    def test_write_batch_reuses_one_writer(self, temp_dir):
+        """Test that successive batches go through the same open file and DictWriter."""
+        csv_path = temp_dir / "test.csv"
+        handler = CSVHandler(csv_path, batch_size=1)
+
+        files = [
+            EbookFile(
+                full_path=temp_dir / f"file{i}.pdf",
+                relative_path=Path(f"file{i}.pdf"),
+                filename=f"file{i}.pdf",
+                file_size=100,
+                file_extension=".pdf",
+            )
+            for i in range(2)
+        ]
+
+        handler.write_batch([files[0]])
+        writer = handler._writer
+        handler.write_batch([files[1]])
+        assert handler._writer is writer
+
+        handler.close()
+        assert handler._file is None
+        assert handler.get_last_processed_index() == 2
+
+    def test_context_manager_flushes_and_closes(self, temp_dir):
+        """Test that leaving the context writes buffered rows and closes the file."""
+        csv_path = temp_dir / "test.csv"
+        file = EbookFile(
+            full_path=temp_dir / "file.pdf",
+            relative_path=Path("file.pdf"),
+            filename="file.pdf",
+            file_size=100,
+            file_extension=".pdf",
+        )
+
+        with CSVHandler(csv_path) as handler:
+            handler.write_batch([file])
+
+        assert handler._file is None
+        with open(csv_path, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["filename"] for row in rows] == ["file.pdf"]
+
+    def test_flush_matches_csv_module_output(self, temp_dir):
+        """Test that fast-path and quoted rows match what csv.DictWriter writes."""
+        csv_path = temp_dir / "test.csv"
+        names = ["plain.pdf", "comma, title.pdf", 'quote "title".pdf']
+        files = [
+            EbookFile(
+                full_path=temp_dir / name,
+                relative_path=Path(name),
+                filename=name,
+                file_size=100,
+                file_extension=".pdf",
+            )
+            for name in names
+        ]
+
+        with CSVHandler(csv_path) as handler:
+            handler.write_batch(files)
+
+        with open(csv_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["filename"] for row in rows] == names
+        assert len({row["processed_at"] for row in rows}) == 1
+
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            expected = [
+                {**file.to_dict(), "processed_at": rows[0]["processed_at"]} for file in files
+            ]
+            buffer = io.StringIO(newline="")
+            writer = csv.DictWriter(buffer, fieldnames=CSVHandler.FIELDS)
+            writer.writeheader()
+            writer.writerows(expected)
+            assert f.read() == buffer.getvalue()
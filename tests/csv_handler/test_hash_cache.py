@@ -0,0 +1,85 @@
+"""
+Tests for HashCache class.
+"""
+
+import os
+
+from ebook_calibre_analyzer.csv_handler import HashCache
+
+
+class TestHashCache:
+    """Test cases for HashCache class."""
+
+    def test_get_returns_none_for_unknown_file(self, temp_dir):
+        """Test that get returns None when the file has no entry."""
+        cache = HashCache(temp_dir / "hashes.csv")
+        assert cache.get(str(temp_dir / "book.pdf"), "full") is None
+
+    def test_put_then_get_returns_hash(self, temp_dir):
+        """Test that get returns a hash recorded with put."""
+        book = temp_dir / "book.pdf"
+        book.write_bytes(b"content")
+        cache = HashCache(temp_dir / "hashes.csv")
+
+        cache.put(str(book), "full", b"\x01\x02", *HashCache.file_stamp(str(book)))
+
+        assert cache.get(str(book), "full") == b"\x01\x02"
+        assert cache.get(str(book), "1k") is None
+
+    def test_save_persists_entries_for_new_instance(self, temp_dir):
+        """Test that saved entries are loaded by a new HashCache."""
+        book = temp_dir / "book.pdf"
+        book.write_bytes(b"content")
+        cache_path = temp_dir / "hashes.csv"
+        cache = HashCache(cache_path)
+        cache.put(str(book), "1k", b"\xab" * 32, *HashCache.file_stamp(str(book)))
+        cache.save()
+
+        reloaded = HashCache(cache_path)
+        assert len(reloaded) == 1
+        assert reloaded.get(str(book), "1k") == b"\xab" * 32
+
+    def test_get_misses_when_file_modified(self, temp_dir):
+        """Test that get ignores entries whose size or mtime no longer match."""
+        book = temp_dir / "book.pdf"
+        book.write_bytes(b"content")
+        cache = HashCache(temp_dir / "hashes.csv")
+        cache.put(str(book), "full", b"\x01", *HashCache.file_stamp(str(book)))
+
+        book.write_bytes(b"changed content")
+        stat = book.stat()
+        os.utime(book, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert cache.get(str(book), "full") is None
+
+    def test_save_without_entries_creates_no_file(self, temp_dir):
+        """Test that save does not create a cache file when nothing was recorded."""
+        cache_path = temp_dir / "hashes.csv"
+        HashCache(cache_path).save()
+        assert not cache_path.exists()
+
+    def test_load_skips_malformed_rows(self, temp_dir):
+        """Test that malformed rows in the cache file are ignored."""
+        cache_path = temp_dir / "hashes.csv"
+        cache_path.write_text(
+            "full_path,stage,file_size,mtime_ns,hash\n/a.pdf,full,notanint,1,00\n",
+            encoding="utf-8",
+        )
+        assert len(HashCache(cache_path)) == 0
+
+    def test_get_misses_when_file_changed_after_stamp(self, temp_dir):
+        """Test that a file modified between file_stamp and put is not served from cache."""
+        book = temp_dir / "book.pdf"
+        book.write_bytes(b"content")
+        cache = HashCache(temp_dir / "hashes.csv")
+
+        stamp = HashCache.file_stamp(str(book))
+        # Modified while it was being hashed
+        book.write_bytes(b"changed content")
+        cache.put(str(book), "full", b"\x01", *stamp)
+
+        assert cache.get(str(book), "full") is None
+
+    def test_file_stamp_returns_none_for_missing_file(self, temp_dir):
+        """Test that file_stamp returns None when the file cannot be stat'ed."""
+        assert HashCache.file_stamp(str(temp_dir / "missing.pdf")) is None
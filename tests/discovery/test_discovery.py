@@ -2,7 +2,9 @@
 Tests for discover_files_recursive function.
 """
 
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -171,3 +173,50 @@ class TestDiscoverFilesRecursive:
         files = discover_files_recursive(temp_dir, [".pdf"])
         # Should find the file normally
         assert len(files) == 1
+
+    def test_returns_files_sorted_by_full_path(self, temp_dir):
+        """Test that discover_files_recursive returns a stable, path-sorted result."""
+        for subdir in ["b", "a/c", "a"]:
+            (temp_dir / subdir).mkdir(parents=True, exist_ok=True)
+            (temp_dir / subdir / "book.pdf").write_bytes(b"content")
+        (temp_dir / "z.pdf").write_bytes(b"content")
+
+        files = discover_files_recursive(temp_dir, [".pdf"])
+        assert [f.relative_path for f in files] == [
+            Path("a/book.pdf"),
+            Path("a/c/book.pdf"),
+            Path("b/book.pdf"),
+            Path("z.pdf"),
+        ]
+
+    def test_skips_unreadable_directories(self, temp_dir):
+        """Test that discover_files_recursive skips directories it cannot list."""
+        (temp_dir / "locked").mkdir()
+        (temp_dir / "locked" / "hidden.pdf").write_bytes(b"content")
+        (temp_dir / "book.pdf").write_bytes(b"content")
+
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if os.path.basename(path) == "locked":
+                raise PermissionError(path)
+            return real_scandir(path)
+
+        with patch("ebook_calibre_analyzer.discovery.os.scandir", side_effect=scandir):
+            files = discover_files_recursive(temp_dir, [".pdf"])
+
+        assert [f.filename for f in files] == ["book.pdf"]
+
+    def test_does_not_follow_directory_symlinks(self, temp_dir):
+        """Test that discover_files_recursive does not descend into symlinked directories."""
+        outside = temp_dir / "outside"
+        outside.mkdir()
+        (outside / "book.pdf").write_bytes(b"content")
+        root = temp_dir / "root"
+        root.mkdir()
+        try:
+            os.symlink(outside, root / "link", target_is_directory=True)
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks unavailable")
+
+        assert discover_files_recursive(root, [".pdf"]) == []
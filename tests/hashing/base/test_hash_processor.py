@@ -1,18 +1,19 @@
 """
-Tests for HashProcessor abstract base class.
+Tests for HashProcessor protocol.
 """
 
 import pytest
 
 from ebook_calibre_analyzer.hashing.base import HashProcessor
+from ebook_calibre_analyzer.hashing.cpu import CPUHashProcessor
+from ebook_calibre_analyzer.hashing.gpu import GPUHashProcessor
 
 
 class TestHashProcessor:
-    """Test cases for HashProcessor abstract base class."""
+    """Test cases for HashProcessor protocol."""
 
-    def test_is_abstract_base_class(self):
-        """Test that HashProcessor is an abstract base class."""
-        # Cannot instantiate abstract class
+    def test_cannot_be_instantiated(self):
+        """Test that HashProcessor cannot be instantiated directly."""
         with pytest.raises(TypeError):
             HashProcessor()  # type: ignore
 
@@ -57,3 +58,32 @@ class TestHashProcessor:
 
         with pytest.raises(TypeError):
             IncompleteProcessor()  # type: ignore
+
+    def test_concrete_processors_conform(self):
+        """Test that the CPU and GPU processors satisfy the protocol."""
+        assert isinstance(CPUHashProcessor(), HashProcessor)
+        assert isinstance(GPUHashProcessor(), HashProcessor)
+
+    def test_structural_match_conforms_without_subclassing(self):
+        """Test that a class with the three methods satisfies the protocol."""
+
+        class DuckProcessor:
+            def hash_first_1k(self, file):
+                return b""
+
+            def hash_full_file(self, file):
+                return b""
+
+            def hash_batch(self, files, stage):
+                return []
+
+        assert isinstance(DuckProcessor(), HashProcessor)
+
+    def test_partial_match_does_not_conform(self):
+        """Test that a class missing a method does not satisfy the protocol."""
+
+        class PartialProcessor:
+            def hash_first_1k(self, file):
+                return b""
+
+        assert not isinstance(PartialProcessor(), HashProcessor)
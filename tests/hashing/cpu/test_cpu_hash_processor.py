@@ -4,9 +4,11 @@ Tests for CPUHashProcessor class.
 
 import hashlib
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from ebook_calibre_analyzer.csv_handler import HashCache
 from ebook_calibre_analyzer.hashing.cpu import CPUHashProcessor
 from ebook_calibre_analyzer.models import EbookFile
 
@@ -88,6 +90,30 @@ class TestCPUHashProcessor:
             expected = hashlib.sha256(contents[i]).digest()
             assert result == expected
 
+    def test_hash_batch_preserves_order_across_chunks(self, temp_dir):
+        """Test that hash_batch keeps input order when files are dispatched in chunks."""
+        processor = CPUHashProcessor(num_workers=2)
+
+        files = []
+        contents = []
+        for i in range(25):
+            test_file = temp_dir / f"file{i}.pdf"
+            content = f"content{i}".encode()
+            test_file.write_bytes(content)
+            contents.append(content)
+            files.append(
+                EbookFile(
+                    full_path=test_file,
+                    relative_path=Path(f"file{i}.pdf"),
+                    filename=f"file{i}.pdf",
+                    file_size=len(content),
+                    file_extension=".pdf",
+                )
+            )
+
+        results = processor.hash_batch(files, "full")
+        assert results == [hashlib.sha256(content).digest() for content in contents]
+
     def test_hash_batch_uses_correct_worker_for_1k(self, temp_dir):
         """Test that hash_batch uses correct worker for stage='1k'."""
         processor = CPUHashProcessor()
@@ -155,7 +181,7 @@ class TestCPUHashProcessor:
         assert results == []
 
     def test_hash_batch_handles_exception_in_worker(self, temp_dir):
-        """Test that hash_batch handles exceptions from worker processes."""
+        """Test that hash_batch handles exceptions from worker threads."""
         processor = CPUHashProcessor()
 
         # Create a file that will cause an error
@@ -170,26 +196,46 @@ class TestCPUHashProcessor:
             file_extension=".pdf",
         )
 
-        # Mock ProcessPoolExecutor to simulate exception
-        from unittest.mock import MagicMock, patch
-
-        # Create a proper mock Future that works with as_completed
-        mock_future = MagicMock()
-        mock_future.result.side_effect = Exception("Worker error")
-        # Add attributes needed by as_completed
-        mock_future._condition = MagicMock()
-        mock_future._condition.acquire = MagicMock(return_value=True)
-        mock_future._condition.release = MagicMock()
-        mock_future._state = "FINISHED"
-
-        with patch("ebook_calibre_analyzer.hashing.cpu.ProcessPoolExecutor") as mock_executor:
-            mock_executor_instance = MagicMock()
-            mock_executor.return_value.__enter__.return_value = mock_executor_instance
-            mock_executor_instance.submit.return_value = mock_future
-            mock_executor_instance.__enter__ = MagicMock(return_value=mock_executor_instance)
-            mock_executor_instance.__exit__ = MagicMock(return_value=False)
-
+        # Make the worker raise to simulate an unexpected failure
+        with patch(
+            "ebook_calibre_analyzer.hashing.cpu._hash_full_file_worker",
+            side_effect=Exception("Worker error"),
+        ):
             results = processor.hash_batch([file], "full")
             # Should return empty bytes on exception
             assert len(results) == 1
             assert results[0] == b""
+
+    def test_hash_batch_reuses_cached_hashes(self, temp_dir):
+        """Test that hash_batch only hashes files missing from the hash cache."""
+        files = []
+        for name in ("cached.pdf", "new.pdf"):
+            test_file = temp_dir / name
+            test_file.write_bytes(name.encode())
+            files.append(
+                EbookFile(
+                    full_path=test_file,
+                    relative_path=Path(name),
+                    filename=name,
+                    file_size=len(name),
+                    file_extension=".pdf",
+                )
+            )
+
+        cache = HashCache(temp_dir / "hashes.csv")
+        cache.put(
+            files[0].full_path_str, "full", b"cached", *HashCache.file_stamp(files[0].full_path_str)
+        )
+        processor = CPUHashProcessor(hash_cache=cache)
+
+        with patch(
+            "ebook_calibre_analyzer.hashing.cpu._hash_full_file_worker",
+            return_value=b"computed",
+        ) as worker:
+            results = processor.hash_batch(files, "full")
+
+        assert results == [b"cached", b"computed"]
+        worker.assert_called_once_with(files[1].full_path_str)
+        assert cache.get(files[1].full_path_str, "full") == b"computed"
+        # Saved as soon as the batch is hashed, not only at the end of the run
+        assert HashCache(temp_dir / "hashes.csv").get(files[1].full_path_str, "full") == b"computed"
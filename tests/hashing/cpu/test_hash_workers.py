@@ -3,8 +3,19 @@ Tests for CPU hash worker functions.
 """
 
 import hashlib
+from unittest.mock import patch
 
-from ebook_calibre_analyzer.hashing.cpu import _hash_first_1k_worker, _hash_full_file_worker
+import pytest
+
+from ebook_calibre_analyzer.hashing.cpu import (
+    _SHA256_TEMPLATE,
+    _feed_sha256,
+    _hash_chunk_worker,
+    _hash_direct_file,
+    _hash_first_1k_worker,
+    _hash_full_file_worker,
+    _prefetch,
+)
 
 
 class TestHashFirst1KWorker:
@@ -107,9 +118,9 @@ class TestHashFullFileWorker:
         expected_hash = hashlib.sha256(b"").digest()
         assert result == expected_hash
 
-    def test_reads_in_1mb_chunks(self, temp_dir):
-        """Test that _hash_full_file_worker reads in 1MB chunks."""
-        # Create a file larger than 1MB to test chunking
+    def test_handles_multi_megabyte_file(self, temp_dir):
+        """Test that _hash_full_file_worker hashes files spanning several read buffers."""
+        # Create a file larger than any single read buffer
         test_file = temp_dir / "large.pdf"
         content = b"x" * (2 * 1024 * 1024)  # 2MB
         test_file.write_bytes(content)
@@ -120,3 +131,131 @@ class TestHashFullFileWorker:
         # Verify it hashed the entire file correctly
         expected_hash = hashlib.sha256(content).digest()
         assert result == expected_hash
+
+    def test_leaves_shared_template_unchanged(self, temp_dir):
+        """Test that hashing never updates the shared SHA-256 template context."""
+        test_file = temp_dir / "test.pdf"
+        test_file.write_bytes(b"template check")
+
+        _hash_full_file_worker(str(test_file))
+        _hash_first_1k_worker(str(test_file))
+        assert _SHA256_TEMPLATE.digest() == hashlib.sha256().digest()
+
+    def test_small_file_is_hashed_without_mmap(self, temp_dir):
+        """Test that _hash_full_file_worker hashes files up to 1MB from a single read."""
+        test_file = temp_dir / "small.pdf"
+        content = b"s" * (1024 * 1024)
+        test_file.write_bytes(content)
+
+        with patch("ebook_calibre_analyzer.hashing.cpu.mmap.mmap") as mock_mmap:
+            result = _hash_full_file_worker(str(test_file))
+        mock_mmap.assert_not_called()
+        assert result == hashlib.sha256(content).digest()
+
+    def test_falls_back_to_reading_when_mmap_fails(self, temp_dir):
+        """Test that _hash_full_file_worker reads the file when mmap is unsupported."""
+        test_file = temp_dir / "large.pdf"
+        content = b"y" * (2 * 1024 * 1024)  # 2MB, above the mmap threshold
+        test_file.write_bytes(content)
+
+        with patch("ebook_calibre_analyzer.hashing.cpu.mmap.mmap", side_effect=OSError):
+            result = _hash_full_file_worker(str(test_file))
+        assert result == hashlib.sha256(content).digest()
+
+    def test_uses_direct_io_above_threshold(self, temp_dir):
+        """Test that _hash_full_file_worker hashes large files correctly via O_DIRECT or fallback."""
+        test_file = temp_dir / "large.pdf"
+        content = b"z" * (3 * 1024 * 1024 + 17)
+        test_file.write_bytes(content)
+
+        with patch("ebook_calibre_analyzer.hashing.cpu._DIRECT_IO_THRESHOLD", 1024):
+            result = _hash_full_file_worker(str(test_file))
+        assert result == hashlib.sha256(content).digest()
+
+    def test_falls_back_when_direct_io_fails(self, temp_dir):
+        """Test that _hash_full_file_worker falls back when O_DIRECT is rejected."""
+        test_file = temp_dir / "large.pdf"
+        content = b"w" * (2 * 1024 * 1024)
+        test_file.write_bytes(content)
+
+        with patch("ebook_calibre_analyzer.hashing.cpu._DIRECT_IO_THRESHOLD", 1024), patch(
+            "ebook_calibre_analyzer.hashing.cpu._hash_direct_file", side_effect=OSError
+        ):
+            result = _hash_full_file_worker(str(test_file))
+        assert result == hashlib.sha256(content).digest()
+
+
+class TestHashDirectFile:
+    """Test cases for _hash_direct_file function."""
+
+    def test_returns_hash_of_unaligned_file(self, temp_dir):
+        """Test that _hash_direct_file hashes a file whose size is not block aligned."""
+        test_file = temp_dir / "test.pdf"
+        content = bytes(range(256)) * (20 * 1024) + b"tail"  # spans two 4MB buffers
+        test_file.write_bytes(content)
+
+        try:
+            result = _hash_direct_file(str(test_file))
+        except OSError:
+            pytest.skip("O_DIRECT not supported on this filesystem")
+        assert result == hashlib.sha256(content).digest()
+
+
+class TestFeedSHA256:
+    """Test cases for _feed_sha256 function."""
+
+    def test_hashes_across_chunk_boundaries(self, temp_dir):
+        """Test that _feed_sha256 hashes a file spanning several partial chunks."""
+        test_file = temp_dir / "test.pdf"
+        content = bytes(range(256)) * (10 * 1024 + 7)  # ~2.5MB, not chunk aligned
+        test_file.write_bytes(content)
+
+        with open(test_file, "rb") as f:
+            result = _feed_sha256(f)
+        assert result == hashlib.sha256(content).digest()
+
+    def test_handles_empty_file(self, temp_dir):
+        """Test that _feed_sha256 returns the empty-input hash for an empty file."""
+        test_file = temp_dir / "empty.pdf"
+        test_file.write_bytes(b"")
+
+        with open(test_file, "rb") as f:
+            result = _feed_sha256(f)
+        assert result == hashlib.sha256(b"").digest()
+
+
+class TestHashChunkWorker:
+    """Test cases for _hash_chunk_worker function."""
+
+    def test_prefetches_next_file_before_hashing(self):
+        """Test that _hash_chunk_worker requests readahead for each following file."""
+        calls = []
+
+        def worker(file_path):
+            calls.append(("hash", file_path))
+            return file_path.encode()
+
+        with patch(
+            "ebook_calibre_analyzer.hashing.cpu._prefetch",
+            side_effect=lambda path: calls.append(("prefetch", path)),
+        ):
+            results = _hash_chunk_worker(worker, ["a", "b", "c"], prefetch=True)
+
+        assert results == [b"a", b"b", b"c"]
+        assert calls == [
+            ("prefetch", "b"),
+            ("hash", "a"),
+            ("prefetch", "c"),
+            ("hash", "b"),
+            ("hash", "c"),
+        ]
+
+    def test_does_not_prefetch_by_default(self):
+        """Test that _hash_chunk_worker skips readahead unless requested."""
+        with patch("ebook_calibre_analyzer.hashing.cpu._prefetch") as mock_prefetch:
+            _hash_chunk_worker(lambda path: b"", ["a", "b"])
+        mock_prefetch.assert_not_called()
+
+    def test_prefetch_ignores_missing_file(self, temp_dir):
+        """Test that _prefetch does not raise for a file that cannot be opened."""
+        _prefetch(str(temp_dir / "missing.pdf"))
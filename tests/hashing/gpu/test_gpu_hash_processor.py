@@ -4,8 +4,11 @@ Tests for GPUHashProcessor class.
 
 import hashlib
 from pathlib import Path
+from unittest.mock import patch
 
-from ebook_calibre_analyzer.hashing.gpu import GPUHashProcessor
+from ebook_calibre_analyzer.csv_handler import HashCache
+from ebook_calibre_analyzer.hashing.cpu import CPUHashProcessor
+from ebook_calibre_analyzer.hashing.gpu import GPUHashProcessor, _KernelLaunch
 from ebook_calibre_analyzer.models import EbookFile
 
 
@@ -180,3 +183,186 @@ class TestGPUHashProcessor:
             assert len(result) == 32
             expected = hashlib.sha256(content).digest()
             assert result == expected
+
+    def test_hash_batch_limits_in_flight_launches_to_stream_count(self, temp_dir):
+        """Test that hash_batch keeps at most one queued launch per stream."""
+        processor = GPUHashProcessor(batch_size=2)
+        processor._gpu_available = True
+        processor._streams = ["stream0", "stream1"]
+
+        files = []
+        for i in range(7):
+            test_file = temp_dir / f"test{i}.pdf"
+            test_file.write_bytes(b"x")
+            files.append(
+                EbookFile(
+                    full_path=test_file,
+                    relative_path=Path(f"test{i}.pdf"),
+                    filename=f"test{i}.pdf",
+                    file_size=1,
+                    file_extension=".pdf",
+                )
+            )
+
+        in_flight = []
+        max_in_flight = 0
+        used_streams = []
+
+        def fake_launch(batch, stream):
+            nonlocal max_in_flight
+            used_streams.append(stream)
+            launch = _KernelLaunch(
+                results=[f.filename.encode() for f in batch], kernel_indices=[], stream=stream
+            )
+            in_flight.append(launch)
+            max_in_flight = max(max_in_flight, len(in_flight))
+            return launch
+
+        def fake_collect(launch):
+            in_flight.remove(launch)
+            return launch.results
+
+        processor._launch_batch_kernel = fake_launch
+        processor._collect_batch_kernel = fake_collect
+        results = processor.hash_batch(files, "full")
+
+        assert results == [f.filename.encode() for f in files]
+        assert max_in_flight == 2
+        assert used_streams == ["stream0", "stream1", "stream0", "stream1"]
+
+    def test_hash_batch_falls_back_per_file_when_launch_fails(self, temp_dir):
+        """Test that hash_batch hashes files individually when a kernel launch fails."""
+        processor = GPUHashProcessor()
+        processor._gpu_available = True
+
+        test_file = temp_dir / "test.pdf"
+        content = b"fallback content"
+        test_file.write_bytes(content)
+        file = EbookFile(
+            full_path=test_file,
+            relative_path=Path("test.pdf"),
+            filename="test.pdf",
+            file_size=len(content),
+            file_extension=".pdf",
+        )
+
+        def failing_launch(batch, stream):
+            raise RuntimeError("launch failed")
+
+        processor._launch_batch_kernel = failing_launch
+        results = processor.hash_batch([file], "full")
+        assert results == [hashlib.sha256(content).digest()]
+
+    def test_hash_batch_keeps_large_files_off_the_kernel(self, temp_dir):
+        """Test that hash_batch hashes files above kernel_max_size on the CPU."""
+        processor = GPUHashProcessor(kernel_max_size=16)
+        processor._gpu_available = True
+
+        files = []
+        contents = [b"small", b"x" * 64, b"tiny"]
+        for i, content in enumerate(contents):
+            test_file = temp_dir / f"test{i}.pdf"
+            test_file.write_bytes(content)
+            files.append(
+                EbookFile(
+                    full_path=test_file,
+                    relative_path=Path(f"test{i}.pdf"),
+                    filename=f"test{i}.pdf",
+                    file_size=len(content),
+                    file_extension=".pdf",
+                )
+            )
+
+        launched = []
+
+        def fake_launch(batch, stream):
+            launched.extend(f.filename for f in batch)
+            results = [hashlib.sha256(f.full_path.read_bytes()).digest() for f in batch]
+            return _KernelLaunch(results=results, kernel_indices=[], stream=stream)
+
+        processor._launch_batch_kernel = fake_launch
+        results = processor.hash_batch(files, "full")
+
+        assert launched == ["test0.pdf", "test2.pdf"]
+        assert results == [hashlib.sha256(content).digest() for content in contents]
+
+    def test_split_batches_caps_files_and_bytes(self, ebook_file_factory, temp_dir):
+        """Test that _split_batches limits each batch by file count and total bytes."""
+        processor = GPUHashProcessor(batch_size=3, max_batch_bytes=100)
+        sizes = [40, 40, 40, 10, 10, 10, 10, 500, 1]
+        files = [
+            ebook_file_factory(temp_dir, f"test{i}.pdf", size=size) for i, size in enumerate(sizes)
+        ]
+
+        assert processor._split_batches(files) == [(0, 2), (2, 5), (5, 7), (7, 8), (8, 9)]
+
+    def test_hash_batch_keeps_pool_for_later_batches(self, temp_dir):
+        """Test that hash_batch leaves pooled GPU memory for later calls to reuse."""
+        processor = GPUHashProcessor()
+        processor._gpu_available = True
+
+        test_file = temp_dir / "test.pdf"
+        test_file.write_bytes(b"content")
+        file = EbookFile(
+            full_path=test_file,
+            relative_path=Path("test.pdf"),
+            filename="test.pdf",
+            file_size=7,
+            file_extension=".pdf",
+        )
+
+        def failing_launch(batch, stream):
+            raise RuntimeError("launch failed")
+
+        processor._launch_batch_kernel = failing_launch
+        with patch.object(processor.gpu_pool, "cleanup") as mock_cleanup:
+            processor.hash_batch([file], "full")
+        mock_cleanup.assert_not_called()
+
+    def test_cleanup_releases_pool(self):
+        """Test that cleanup hands pooled GPU memory back."""
+        processor = GPUHashProcessor()
+        with patch.object(processor.gpu_pool, "cleanup") as mock_cleanup:
+            processor.cleanup()
+        mock_cleanup.assert_called_once()
+
+    def test_hash_batch_falls_back_to_injected_cpu_processor(self, ebook_file_factory, temp_dir):
+        """Test that hash_batch hands CPU work to the cpu_processor it was given."""
+        cpu_processor = CPUHashProcessor(num_workers=2)
+        processor = GPUHashProcessor(cpu_processor=cpu_processor)
+        file = ebook_file_factory(temp_dir, "book.pdf", size=2048)
+
+        with patch.object(cpu_processor, "hash_batch", return_value=[b"hash"]) as mock_hash:
+            assert processor.hash_batch([file], "1k") == [b"hash"]
+        mock_hash.assert_called_once_with([file], "1k")
+
+    def test_hash_batch_caches_kernel_hashes(self, temp_dir):
+        """Test that hash_batch stores kernel hashes in the CPU processor's cache and reuses them."""
+        hash_cache = HashCache(temp_dir / "kernel_hashes.csv")
+        processor = GPUHashProcessor(cpu_processor=CPUHashProcessor(hash_cache=hash_cache))
+        processor._gpu_available = True
+
+        test_file = temp_dir / "cached.pdf"
+        content = b"cached content"
+        test_file.write_bytes(content)
+        file = EbookFile(
+            full_path=test_file,
+            relative_path=Path("cached.pdf"),
+            filename="cached.pdf",
+            file_size=len(content),
+            file_extension=".pdf",
+        )
+
+        launched = []
+
+        def fake_launch(batch, stream):
+            launched.extend(f.filename for f in batch)
+            results = [hashlib.sha256(f.full_path.read_bytes()).digest() for f in batch]
+            return _KernelLaunch(results=results, kernel_indices=[], stream=stream)
+
+        processor._launch_batch_kernel = fake_launch
+        expected = [hashlib.sha256(content).digest()]
+        assert processor.hash_batch([file], "full") == expected
+        assert processor.hash_batch([file], "full") == expected
+        assert launched == ["cached.pdf"]
+        assert HashCache(temp_dir / "kernel_hashes.csv").get(str(test_file), "full") == expected[0]
@@ -0,0 +1 @@
+"""Tests for hashing.kernels module."""
@@ -0,0 +1,57 @@
+"""
+Tests for GPU kernel helpers.
+"""
+
+import hashlib
+
+import pytest
+
+from ebook_calibre_analyzer.hashing.kernels import (
+    SHA256_BATCH_KERNEL_SOURCE,
+    SHA256_THREADS_PER_BLOCK,
+    get_sha256_batch_kernel,
+)
+
+
+class TestSHA256BatchKernelSource:
+    """Test cases for the SHA-256 batch kernel source."""
+
+    def test_exports_unmangled_entry_point(self):
+        """Test that the kernel entry point is declared extern C for RawKernel lookup."""
+        assert 'extern "C" __global__ void sha256_batch(' in SHA256_BATCH_KERNEL_SOURCE
+
+
+class TestSHA256BatchKernel:
+    """Test cases for the compiled SHA-256 batch kernel."""
+
+    def test_matches_hashlib_at_padding_boundaries(self):
+        """Test that sha256_batch digests match hashlib around the 55/56/64-byte padding edges."""
+        cp = pytest.importorskip("cupy")
+        try:
+            if cp.cuda.runtime.getDeviceCount() == 0:
+                pytest.skip("No CUDA device")
+        except cp.cuda.runtime.CUDARuntimeError:
+            pytest.skip("No CUDA device")
+        import numpy as np
+
+        source = bytes(range(256)) * 4
+        messages = [source[:length] for length in (0, 55, 56, 63, 64, 1000)]
+        lengths = [len(message) for message in messages]
+        offsets = [sum(lengths[:position]) for position in range(len(messages))]
+        buffer = b"".join(messages)
+
+        gpu_data = cp.asarray(np.frombuffer(buffer, dtype=np.uint8))
+        gpu_offsets = cp.asarray(np.array(offsets, dtype=np.uint64))
+        gpu_lengths = cp.asarray(np.array(lengths, dtype=np.uint64))
+        gpu_digests = cp.zeros(32 * len(messages), dtype=cp.uint8)
+        num_blocks = (len(messages) + SHA256_THREADS_PER_BLOCK - 1) // SHA256_THREADS_PER_BLOCK
+        get_sha256_batch_kernel()(
+            (num_blocks,),
+            (SHA256_THREADS_PER_BLOCK,),
+            (gpu_data, gpu_offsets, gpu_lengths, gpu_digests, np.int32(len(messages))),
+        )
+
+        digests = cp.asnumpy(gpu_digests).tobytes()
+        for position, message in enumerate(messages):
+            expected = hashlib.sha256(message).digest()
+            assert digests[32 * position : 32 * (position + 1)] == expected, len(message)
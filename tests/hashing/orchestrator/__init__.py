@@ -0,0 +1 @@
+"""Tests for hashing.orchestrator module."""
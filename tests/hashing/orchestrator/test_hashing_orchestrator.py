@@ -0,0 +1,98 @@
+"""
+Tests for HashingOrchestrator class.
+"""
+
+from pathlib import Path
+
+from ebook_calibre_analyzer.hashing.orchestrator import HashingOrchestrator
+from ebook_calibre_analyzer.models import EbookFile, FileCollection
+
+
+class RecordingProcessor:
+    """Hash processor that records which files it was asked to hash."""
+
+    def __init__(self):
+        self.calls = []
+
+    def hash_first_1k(self, file):
+        return b"1k"
+
+    def hash_full_file(self, file):
+        return b"full"
+
+    def hash_batch(self, files, stage):
+        self.calls.append((stage, list(files)))
+        return [f"{stage}-{f.file_size}".encode() for f in files]
+
+
+def _make_file(temp_dir, name, size, first_1k_hash=None):
+    return EbookFile(
+        full_path=temp_dir / name,
+        relative_path=Path(name),
+        filename=name,
+        file_size=size,
+        file_extension=".pdf",
+        first_1k_hash=first_1k_hash,
+    )
+
+
+class TestHashingOrchestrator:
+    """Test cases for HashingOrchestrator class."""
+
+    def test_stage2_hashes_only_calibre_files_in_shared_size_buckets(self, temp_dir):
+        """Test that hash_stage2_files skips Calibre files whose size has no candidate."""
+        ebooks_collection = FileCollection()
+        calibre_collection = FileCollection()
+        candidate = _make_file(temp_dir, "ebook.pdf", 100)
+        ebooks_collection.add_file(candidate)
+        matching = _make_file(temp_dir, "match.pdf", 100)
+        calibre_collection.add_file(matching)
+        for size in range(200, 210):
+            calibre_collection.add_file(_make_file(temp_dir, f"other_{size}.pdf", size))
+
+        processor = RecordingProcessor()
+        orchestrator = HashingOrchestrator(ebooks_collection, calibre_collection, processor)
+        calibre_candidates, _ = orchestrator.hash_stage2_files([candidate])
+
+        assert calibre_candidates == [matching]
+        assert processor.calls[0] == ("1k", [matching])
+        assert matching.first_1k_hash == b"1k-100"
+
+    def test_stage3_hashes_each_matching_calibre_file_once(self, temp_dir):
+        """Test that hash_stage3_files finds Calibre files by size and 1KB hash once each."""
+        ebooks_collection = FileCollection()
+        calibre_collection = FileCollection()
+        candidate = _make_file(temp_dir, "ebook.pdf", 2048, first_1k_hash=b"a")
+        ebooks_collection.add_file(candidate)
+        matching = _make_file(temp_dir, "match.pdf", 2048, first_1k_hash=b"a")
+        calibre_collection.add_file(matching)
+        # Re-indexing after a re-hash must not produce a second candidate
+        calibre_collection.by_size_and_1k[(2048, b"a")].append(matching)
+        calibre_collection.add_file(_make_file(temp_dir, "other.pdf", 2048, first_1k_hash=b"b"))
+
+        processor = RecordingProcessor()
+        orchestrator = HashingOrchestrator(ebooks_collection, calibre_collection, processor)
+        calibre_candidates, _ = orchestrator.hash_stage3_files([candidate])
+
+        assert calibre_candidates == [matching]
+        assert processor.calls[0] == ("full", [matching])
+
+    def test_stage3_reuses_1k_hash_for_small_files(self, temp_dir):
+        """Test that files no larger than 1KB take their full hash from the 1KB hash."""
+        ebooks_collection = FileCollection()
+        calibre_collection = FileCollection()
+        small = _make_file(temp_dir, "small.pdf", 1024, first_1k_hash=b"small")
+        large = _make_file(temp_dir, "large.pdf", 1025, first_1k_hash=b"large")
+        ebooks_collection.add_file(small)
+        ebooks_collection.add_file(large)
+        calibre_small = _make_file(temp_dir, "calibre_small.pdf", 1024, first_1k_hash=b"small")
+        calibre_collection.add_file(calibre_small)
+
+        processor = RecordingProcessor()
+        orchestrator = HashingOrchestrator(ebooks_collection, calibre_collection, processor)
+        orchestrator.hash_stage3_files([small, large])
+
+        assert small.full_hash == b"small"
+        assert calibre_small.full_hash == b"small"
+        assert calibre_collection.get_file_by_full_hash(b"small") is calibre_small
+        assert processor.calls == [("full", [large])]
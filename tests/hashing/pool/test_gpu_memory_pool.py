@@ -2,6 +2,8 @@
 Tests for GPUMemoryPool class.
 """
 
+from types import SimpleNamespace
+
 from ebook_calibre_analyzer.hashing.pool import GPUMemoryPool
 
 
@@ -51,3 +53,71 @@ class TestGPUMemoryPool:
         pool.cleanup()
         assert len(pool.allocated_buffers) == 0
         assert pool.allocated_buffers == {}
+
+    def test_bucket_size_rounds_up_to_power_of_two(self):
+        """Test that bucket_size rounds sizes up to the next power of two."""
+        assert GPUMemoryPool.bucket_size(0) == 1
+        assert GPUMemoryPool.bucket_size(1) == 1
+        assert GPUMemoryPool.bucket_size(1000) == 1024
+        assert GPUMemoryPool.bucket_size(1024) == 1024
+        assert GPUMemoryPool.bucket_size(1025) == 2048
+
+    def test_acquire_reuses_released_buffer(self):
+        """Test that acquire returns a released buffer from the matching bucket."""
+        pool = GPUMemoryPool()
+        buffer = SimpleNamespace(nbytes=4096)
+        pool.release(buffer)
+
+        assert pool.acquire(3000) is buffer
+        assert pool._free_buckets[4096] == []
+
+    def test_cleanup_clears_free_buckets(self):
+        """Test that cleanup drops pooled buffers."""
+        pool = GPUMemoryPool()
+        pool.release(SimpleNamespace(nbytes=1024))
+        pool.cleanup()
+        assert pool._free_buckets == {}
+
+    def test_pinned_buffers_use_separate_buckets(self):
+        """Test that pinned host buffers are not handed out as device buffers."""
+        pool = GPUMemoryPool()
+        pinned = SimpleNamespace(nbytes=2048)
+        pool.release(pinned, pinned=True)
+
+        assert pool._free_buckets.get(2048) is None
+        assert pool.acquire(2048, pinned=True) is pinned
+
+    def test_can_allocate_checks_bucket_size(self, monkeypatch):
+        """Test that can_allocate compares the rounded bucket size, not the requested size."""
+        pool = GPUMemoryPool()
+        pool._gpu_available = True
+        monkeypatch.setattr(pool, "get_available_memory", lambda: 2000)
+
+        # 1000 bytes fits in 90% of 2000, but its 1024-byte bucket plus 1024 does not
+        assert pool.can_allocate(1000)
+        assert not pool.can_allocate(1000, 1000)
+
+    def test_can_allocate_counts_pooled_buffers_as_free(self, monkeypatch):
+        """Test that can_allocate needs no new memory for sizes a pooled buffer covers."""
+        pool = GPUMemoryPool()
+        pool._gpu_available = True
+        monkeypatch.setattr(pool, "get_available_memory", lambda: 0)
+        pool.release(SimpleNamespace(nbytes=4096))
+
+        assert pool.can_allocate(3000)
+        assert not pool.can_allocate(3000, 3000)
+
+    def test_release_drops_buffers_past_max_free_bytes(self):
+        """Test that release keeps at most max_free_bytes of buffers per memory kind."""
+        pool = GPUMemoryPool(max_free_bytes=4096)
+        pool.release(SimpleNamespace(nbytes=4096))
+        pool.release(SimpleNamespace(nbytes=1024))
+        pool.release(SimpleNamespace(nbytes=4096), pinned=True)
+
+        assert len(pool._free_buckets[4096]) == 1
+        assert pool._free_buckets.get(1024) is None
+        assert len(pool._free_pinned_buckets[4096]) == 1
+
+        pool.acquire(4096)
+        pool.release(SimpleNamespace(nbytes=1024))
+        assert len(pool._free_buckets[1024]) == 1
@@ -0,0 +1,8 @@
+"""
+Shared constants for tests.
+"""
+
+# Shape of the canonical ebook tree shared across the session
+CANONICAL_TREE_SIZE = 100
+CANONICAL_TREE_EXTENSIONS = (".pdf", ".epub", ".mobi", ".cbz")
+CANONICAL_TREE_SUBDIRS = ("", "fiction", "fiction/scifi", "comics", "reference/manuals")
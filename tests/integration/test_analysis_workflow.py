@@ -2,10 +2,14 @@
 Tests for full analysis workflow.
 """
 
+from unittest.mock import patch
+
 from ebook_calibre_analyzer.comparison import LibraryComparator
-from ebook_calibre_analyzer.csv_handler import CSVHandler
+from ebook_calibre_analyzer.csv_handler import CSVHandler, HashCache
 from ebook_calibre_analyzer.discovery import discover_files_recursive
+from ebook_calibre_analyzer.hashing import CPUHashProcessor
 from ebook_calibre_analyzer.models import FileCollection
+from tests.helpers import CANONICAL_TREE_EXTENSIONS, CANONICAL_TREE_SIZE
 
 
 class TestAnalysisWorkflow:
@@ -72,25 +76,35 @@ class TestAnalysisWorkflow:
         processed = handler2.get_processed_files()
         assert len(processed) >= 0  # May be 0 or more depending on setup
 
-    def test_handles_large_number_of_files(self, temp_dir):
-        """Test that analysis handles large number of files."""
+    def test_resume_reuses_cached_hashes(self, temp_dir):
+        """Test that a resumed run reuses hashes cached by the previous run."""
         ebooks = temp_dir / "ebooks"
-        calibre = temp_dir / "calibre"
         ebooks.mkdir()
-        calibre.mkdir()
+        (ebooks / "book.pdf").write_bytes(b"book content")
+        files = discover_files_recursive(ebooks, [".pdf"])
+        cache_path = temp_dir / "resume_hashes.csv"
 
-        # Create multiple files
-        for i in range(10):
-            (ebooks / f"book{i}.pdf").write_bytes(f"content{i}".encode())
+        first_cache = HashCache(cache_path)
+        first_hashes = CPUHashProcessor(hash_cache=first_cache).hash_batch(files, "full")
+        first_cache.save()
 
-        files = discover_files_recursive(ebooks, [".pdf"])
-        assert len(files) == 10
+        resumed_cache = HashCache(cache_path)
+        assert resumed_cache.get(files[0].full_path_str, "full") == first_hashes[0]
+        with patch("ebook_calibre_analyzer.hashing.cpu._hash_full_file_worker") as mock_worker:
+            resumed_hashes = CPUHashProcessor(hash_cache=resumed_cache).hash_batch(files, "full")
+        mock_worker.assert_not_called()
+        assert resumed_hashes == first_hashes
+
+    def test_handles_large_number_of_files(self, ebook_tree):
+        """Test that analysis handles large number of files."""
+        files = discover_files_recursive(ebook_tree, list(CANONICAL_TREE_EXTENSIONS))
+        assert len(files) == CANONICAL_TREE_SIZE
 
         collection = FileCollection()
         for file in files:
             collection.add_file(file)
 
-        assert len(collection.files) == 10
+        assert len(collection.files) == CANONICAL_TREE_SIZE
 
     def test_handles_nested_directory_structures(self, temp_dir):
         """Test that analysis handles nested directory structures."""
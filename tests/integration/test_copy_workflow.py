@@ -2,6 +2,7 @@
 Tests for full copy workflow.
 """
 
+import os
 from pathlib import Path
 
 from ebook_calibre_analyzer.copier import FileCopier
@@ -79,8 +80,10 @@ class TestCopyWorkflow:
         # Original should still exist
         assert (target / "book.pdf").exists()
         # New file should have different name
-        copied_files = list(target.glob("book_*.pdf"))
-        assert len(copied_files) > 0
+        assert any(
+            entry.name.startswith("book_") and entry.name.endswith(".pdf")
+            for entry in os.scandir(target)
+        )
 
     def test_preserves_file_metadata(self, temp_dir):
         """Test that copy preserves file metadata."""
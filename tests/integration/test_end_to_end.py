@@ -32,12 +32,10 @@ class TestEndToEnd:
         calibre_files = discover_files_recursive(calibre, [".pdf"])
 
         ebooks_collection = FileCollection()
-        for file in ebooks_files:
-            ebooks_collection.add_file(file)
+        ebooks_collection.extend(ebooks_files)
 
         calibre_collection = FileCollection()
-        for file in calibre_files:
-            calibre_collection.add_file(file)
+        calibre_collection.extend(calibre_files)
 
         comparator = LibraryComparator(ebooks_collection, calibre_collection)
         unique_files = comparator.find_unique_files()
@@ -0,0 +1,52 @@
+"""
+Shared fixtures for CLI entry point tests.
+"""
+
+from pathlib import Path
+from typing import Type
+
+import pytest
+
+from tests.main.helpers import FakeArgs, StubGPUHashProcessor, write_test_csv
+
+
+@pytest.fixture
+def stub_gpu(monkeypatch: pytest.MonkeyPatch) -> Type[StubGPUHashProcessor]:
+    """Replace the package-level GPUHashProcessor with StubGPUHashProcessor."""
+    StubGPUHashProcessor.instances = []
+    monkeypatch.setattr(
+        "ebook_calibre_analyzer.hashing.GPUHashProcessor", StubGPUHashProcessor, raising=False
+    )
+    return StubGPUHashProcessor
+
+
+@pytest.fixture(scope="module")
+def empty_csv(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Write a header-only copy CSV (and an empty ebooks folder) once per module.
+
+    Tests must treat both as read-only; the ebooks folder is the CSV's sibling
+    ``ebooks`` directory.
+    """
+    root = tmp_path_factory.mktemp("copy_inputs")
+    (root / "ebooks").mkdir()
+    csv_file = root / "test.csv"
+    write_test_csv(csv_file, [])
+    return csv_file
+
+
+@pytest.fixture
+def copy_args(empty_csv: Path, tmp_path: Path) -> FakeArgs:
+    """
+    Build ``copy`` command arguments with sensible defaults.
+
+    Points at the shared header-only CSV and ebooks folder, with a per-test
+    target folder. Tests override only the fields they care about with
+    ``dataclasses.replace``.
+    """
+    return FakeArgs(
+        csv_file=empty_csv,
+        ebooks_folder=empty_csv.parent / "ebooks",
+        target_folder=tmp_path / "target",
+        workers=4,
+    )
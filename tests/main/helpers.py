@@ -0,0 +1,74 @@
+"""
+Shared helpers for CLI entry point tests.
+"""
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ebook_calibre_analyzer.hashing import CPUHashProcessor
+from ebook_calibre_analyzer.models import EbookFile
+
+# Columns of the analysis CSV consumed by the copy command
+CSV_FIELDS = ("relative_path", "filename", "file_size", "full_path", "processed_at")
+
+
+def write_test_csv(path: Path, rows: List[dict]) -> None:
+    """Write a copy CSV with a header and the given rows."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@dataclass(frozen=True)
+class FakeArgs:
+    """Parsed CLI arguments for run_analyze/run_copy, with the parser's defaults."""
+
+    # analyze
+    ebooks_folder: Optional[Path] = None
+    calibre_library_folder: Optional[Path] = None
+    output: Optional[Path] = None
+    file_types: Optional[List[str]] = None
+    resume: Optional[Path] = None
+    hash_cache: bool = False
+    batch_size: int = 100
+    use_gpu: bool = False
+    gpu_device: int = 0
+    gpu_threshold: str = "1MB"
+    workers: int = 10
+    # copy
+    csv_file: Optional[Path] = None
+    target_folder: Optional[Path] = None
+    conflict_handling: str = "rename"
+    dry_run: bool = False
+    verbose: bool = False
+
+
+class StubGPUHashProcessor(CPUHashProcessor):
+    """
+    Stand-in for GPUHashProcessor that reports the GPU as available.
+
+    Hashes on the CPU and records each batch, so run_analyze's GPU branch can
+    be exercised without CuPy or a device.
+    """
+
+    # Processors created since the stub_gpu fixture was set up
+    instances: List["StubGPUHashProcessor"] = []
+
+    def __init__(self, device_id: int = 0, kernel_max_size: int = 1024 * 1024, **kwargs):
+        super().__init__(num_workers=1)
+        self.device_id = device_id
+        self.kernel_max_size = kernel_max_size
+        self._gpu_available = True
+        self.batches: List[Tuple[str, List[EbookFile]]] = []
+        self.cleaned_up = False
+        StubGPUHashProcessor.instances.append(self)
+
+    def hash_batch(self, files: List[EbookFile], stage: str) -> List[bytes]:
+        self.batches.append((stage, list(files)))
+        return super().hash_batch(files, stage)
+
+    def cleanup(self) -> None:
+        self.cleaned_up = True
@@ -7,17 +7,16 @@ from unittest.mock import patch
 import pytest
 
 from ebook_calibre_analyzer.__main__ import main
+from tests.main.helpers import write_test_csv
 
 
 class TestMain:
     """Test cases for main function."""
 
-    def test_parses_arguments_correctly(self, temp_dir):
+    def test_parses_arguments_correctly(self, empty_dirs):
         """Test that main parses arguments correctly."""
-        ebooks = temp_dir / "ebooks"
-        calibre = temp_dir / "calibre"
-        ebooks.mkdir()
-        calibre.mkdir()
+        ebooks = empty_dirs / "ebooks"
+        calibre = empty_dirs / "calibre"
 
         with patch("sys.argv", ["ebook-analyzer", "analyze", str(ebooks), str(calibre)]), patch(
             "ebook_calibre_analyzer.__main__.print"
@@ -41,22 +40,15 @@ class TestMain:
             # Should actually run the analyze function
             assert result in [0, 1]
 
-    def test_calls_run_copy_for_copy_command(self, temp_dir):
+    def test_calls_run_copy_for_copy_command(self, fake_fs):
         """Test that main calls run_copy for copy command."""
-        csv_file = temp_dir / "test.csv"
-        ebooks = temp_dir / "ebooks"
-        target = temp_dir / "target"
+        csv_file = fake_fs / "test.csv"
+        ebooks = fake_fs / "ebooks"
+        target = fake_fs / "target"
         ebooks.mkdir()
 
         # Create valid CSV
-        import csv
-
-        with open(csv_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["relative_path", "filename", "file_size", "full_path", "processed_at"],
-            )
-            writer.writeheader()
+        write_test_csv(csv_file, [])
 
         with patch(
             "sys.argv", ["ebook-analyzer", "copy", str(csv_file), str(ebooks), str(target)]
@@ -2,47 +2,44 @@
 Tests for run_analyze function.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+import pytest
 
 from ebook_calibre_analyzer.__main__ import run_analyze
+from ebook_calibre_analyzer.csv_handler import CSVHandler
+from tests.main.helpers import FakeArgs
 
 
 class TestRunAnalyze:
     """Test cases for run_analyze function."""
 
-    def test_returns_1_when_ebooks_folder_missing(self, temp_dir):
+    def test_returns_1_when_ebooks_folder_missing(self, empty_dirs):
         """Test that run_analyze returns 1 when ebooks folder doesn't exist."""
-        args = MagicMock()
-        args.ebooks_folder = temp_dir / "nonexistent"
-        args.calibre_library_folder = temp_dir / "calibre"
-        args.output = None
-        args.file_types = None
-        args.resume = None
-        args.batch_size = 100
-        args.use_gpu = False
-        args.gpu_device = 0
-        args.gpu_threshold = "100MB"
-        args.workers = 10
+        args = FakeArgs(
+            ebooks_folder=empty_dirs / "nonexistent",
+            calibre_library_folder=empty_dirs / "calibre",
+        )
 
         result = run_analyze(args)
         assert result == 1
 
-    def test_returns_1_when_calibre_folder_missing(self, temp_dir):
+    def test_returns_1_when_calibre_folder_missing(self, empty_dirs):
         """Test that run_analyze returns 1 when calibre folder doesn't exist."""
-        ebooks = temp_dir / "ebooks"
-        ebooks.mkdir()
+        args = FakeArgs(
+            ebooks_folder=empty_dirs / "ebooks",
+            calibre_library_folder=empty_dirs / "nonexistent",
+        )
+
+        result = run_analyze(args)
+        assert result == 1
+
+    def test_returns_1_when_ebooks_folder_is_a_file(self, temp_dir, empty_dirs):
+        """Test that run_analyze returns 1 when the ebooks path is a file."""
+        ebooks = temp_dir / "ebooks.pdf"
+        ebooks.write_bytes(b"content")
 
-        args = MagicMock()
-        args.ebooks_folder = ebooks
-        args.calibre_library_folder = temp_dir / "nonexistent"
-        args.output = None
-        args.file_types = None
-        args.resume = None
-        args.batch_size = 100
-        args.use_gpu = False
-        args.gpu_device = 0
-        args.gpu_threshold = "100MB"
-        args.workers = 10
+        args = FakeArgs(ebooks_folder=ebooks, calibre_library_folder=empty_dirs / "calibre")
 
         result = run_analyze(args)
         assert result == 1
@@ -57,17 +54,11 @@ class TestRunAnalyze:
         # Create a test file
         (ebooks / "book.pdf").write_bytes(b"content")
 
-        args = MagicMock()
-        args.ebooks_folder = ebooks
-        args.calibre_library_folder = calibre
-        args.output = None
-        args.file_types = [".pdf"]
-        args.resume = None
-        args.batch_size = 100
-        args.use_gpu = False
-        args.gpu_device = 0
-        args.gpu_threshold = "100MB"
-        args.workers = 10
+        args = FakeArgs(
+            ebooks_folder=ebooks,
+            calibre_library_folder=calibre,
+            file_types=[".pdf"],
+        )
 
         with patch("ebook_calibre_analyzer.__main__.print"):  # Suppress print output
             result = run_analyze(args)
@@ -81,17 +72,11 @@ class TestRunAnalyze:
         calibre.mkdir()
         (ebooks / "book.pdf").write_bytes(b"content")
 
-        args = MagicMock()
-        args.ebooks_folder = ebooks
-        args.calibre_library_folder = calibre
-        args.output = None
-        args.file_types = [".pdf"]
-        args.resume = None
-        args.batch_size = 100
-        args.use_gpu = False
-        args.gpu_device = 0
-        args.gpu_threshold = "100MB"
-        args.workers = 10
+        args = FakeArgs(
+            ebooks_folder=ebooks,
+            calibre_library_folder=calibre,
+            file_types=[".pdf"],
+        )
 
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_analyze(args)
@@ -99,82 +84,139 @@ class TestRunAnalyze:
             # At least one CSV should exist (may have been created)
             assert result in [0, 1]
 
-    def test_handles_gpu_import_success(self, temp_dir):
-        """Test that run_analyze handles GPU import success path."""
+    def test_handles_gpu_import_success(self, temp_dir, stub_gpu):
+        """Test that run_analyze hashes GPU-categorized files with the GPU processor."""
         ebooks = temp_dir / "ebooks"
         calibre = temp_dir / "calibre"
         ebooks.mkdir()
         calibre.mkdir()
-        (ebooks / "book.pdf").write_bytes(b"content")
+        # Same content in Calibre, and over 1KB, so the ebook reaches the full-hash stage
+        content = b"x" * 2048
+        (ebooks / "book.pdf").write_bytes(content)
+        (calibre / "book.pdf").write_bytes(content)
+
+        args = FakeArgs(
+            ebooks_folder=ebooks,
+            calibre_library_folder=calibre,
+            output=temp_dir / "out.csv",
+            file_types=[".pdf"],
+            use_gpu=True,
+            gpu_threshold="4KB",
+        )
 
-        args = MagicMock()
-        args.ebooks_folder = ebooks
-        args.calibre_library_folder = calibre
-        args.output = None
-        args.file_types = [".pdf"]
-        args.resume = None
-        args.batch_size = 100
-        args.use_gpu = True
-        args.gpu_device = 0
-        args.gpu_threshold = "100MB"
-        args.workers = 10
-
-        # The GPU import happens inside run_analyze with: from .hashing import GPUHashProcessor
-        # We can't easily mock this without complex module manipulation.
-        # Instead, test that the function runs successfully with use_gpu=True
-        # The actual GPU path will be tested if GPU is available, or it will fallback to CPU.
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_analyze(args)
-            # Should run successfully (either with GPU if available, or CPU fallback)
-            assert result in [0, 1]
-            # The GPU import success path (lines 103-110) is covered when GPU is actually available
-            # or can be tested separately with integration tests
 
-    def test_handles_resume_mode_correctly(self, temp_dir):
-        """Test that run_analyze handles resume mode correctly."""
+        assert result == 0
+        [processor] = stub_gpu.instances
+        assert processor.kernel_max_size == 4 * 1024
+        assert processor.cleaned_up
+        hashed = {f.full_path for stage, files in processor.batches for f in files}
+        assert {stage for stage, _ in processor.batches} == {"full"}
+        assert hashed == {ebooks / "book.pdf", calibre / "book.pdf"}
+
+    def test_saves_hash_cache_when_interrupted(self, temp_dir):
+        """Test that run_analyze saves the hash cache when a hashing stage is interrupted."""
         ebooks = temp_dir / "ebooks"
         calibre = temp_dir / "calibre"
         ebooks.mkdir()
         calibre.mkdir()
+        # Same size in both libraries, so Stage 2 hashing runs
+        (ebooks / "book.pdf").write_bytes(b"x" * 2048)
+        (calibre / "book.pdf").write_bytes(b"y" * 2048)
+
+        args = FakeArgs(
+            ebooks_folder=ebooks,
+            calibre_library_folder=calibre,
+            output=temp_dir / "out.csv",
+            file_types=[".pdf"],
+            hash_cache=True,
+        )
+
+        with patch("ebook_calibre_analyzer.__main__.print"), patch(
+            "ebook_calibre_analyzer.__main__.HashingOrchestrator.hash_stage2_files",
+            side_effect=KeyboardInterrupt,
+        ), patch("ebook_calibre_analyzer.__main__.HashCache.save") as mock_save, pytest.raises(
+            KeyboardInterrupt
+        ):
+            run_analyze(args)
+
+        mock_save.assert_called_once()
+
+    def test_skips_hash_cache_sidecar_by_default(self, temp_dir):
+        """Test that run_analyze writes no hash cache sidecar without --hash-cache or --resume."""
+        ebooks = temp_dir / "ebooks"
+        calibre = temp_dir / "calibre"
+        ebooks.mkdir()
+        calibre.mkdir()
+        # Same size in both libraries, so Stage 2 hashing runs
+        (ebooks / "book.pdf").write_bytes(b"x" * 2048)
+        (calibre / "book.pdf").write_bytes(b"y" * 2048)
+
+        args = FakeArgs(
+            ebooks_folder=ebooks,
+            calibre_library_folder=calibre,
+            output=temp_dir / "out.csv",
+            file_types=[".pdf"],
+        )
+
+        with patch("ebook_calibre_analyzer.__main__.print"):
+            assert run_analyze(args) == 0
+
+        assert not (temp_dir / "out_hashes.csv").exists()
+
+    def test_handles_resume_mode_correctly(self, temp_dir, empty_dirs):
+        """Test that run_analyze handles resume mode correctly."""
+        ebooks = empty_dirs / "ebooks"
+        calibre = empty_dirs / "calibre"
 
         resume_csv = temp_dir / "resume.csv"
         resume_csv.write_text("relative_path,filename,file_size,full_path,processed_at\n")
 
-        args = MagicMock()
-        args.ebooks_folder = ebooks
-        args.calibre_library_folder = calibre
-        args.output = None
-        args.file_types = [".pdf"]
-        args.resume = resume_csv
-        args.batch_size = 100
-        args.use_gpu = False
-        args.gpu_device = 0
-        args.gpu_threshold = "100MB"
-        args.workers = 10
+        args = FakeArgs(
+            ebooks_folder=ebooks,
+            calibre_library_folder=calibre,
+            file_types=[".pdf"],
+            resume=resume_csv,
+        )
 
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_analyze(args)
             # Should succeed even with resume mode
             assert result in [0, 1]  # May fail if no files found, but should handle resume
 
-    def test_returns_1_when_resume_csv_missing(self, temp_dir):
+    def test_resume_reads_csv_once(self, temp_dir, empty_dirs):
+        """Test that run_analyze scans the resume CSV only once."""
+        resume_csv = temp_dir / "resume.csv"
+        resume_csv.write_text(
+            "relative_path,filename,file_size,full_path,processed_at\n"
+            "a.pdf,a.pdf,1,/books/a.pdf,2024-01-01T00:00:00\n"
+        )
+        args = FakeArgs(
+            ebooks_folder=empty_dirs / "ebooks",
+            calibre_library_folder=empty_dirs / "calibre",
+            file_types=[".pdf"],
+            resume=resume_csv,
+        )
+
+        with patch("ebook_calibre_analyzer.__main__.print"), patch.object(
+            CSVHandler,
+            "get_processed_files",
+            autospec=True,
+            side_effect=CSVHandler.get_processed_files,
+        ) as mock_scan:
+            run_analyze(args)
+
+        assert mock_scan.call_count == 1
+
+    def test_returns_1_when_resume_csv_missing(self, empty_dirs):
         """Test that run_analyze returns 1 when resume CSV doesn't exist."""
-        ebooks = temp_dir / "ebooks"
-        calibre = temp_dir / "calibre"
-        ebooks.mkdir()
-        calibre.mkdir()
-
-        args = MagicMock()
-        args.ebooks_folder = ebooks
-        args.calibre_library_folder = calibre
-        args.output = None
-        args.file_types = [".pdf"]
-        args.resume = temp_dir / "nonexistent.csv"
-        args.batch_size = 100
-        args.use_gpu = False
-        args.gpu_device = 0
-        args.gpu_threshold = "100MB"
-        args.workers = 10
+        args = FakeArgs(
+            ebooks_folder=empty_dirs / "ebooks",
+            calibre_library_folder=empty_dirs / "calibre",
+            file_types=[".pdf"],
+            resume=empty_dirs / "nonexistent.csv",
+        )
 
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_analyze(args)
@@ -2,29 +2,31 @@
 Tests for run_copy function.
 """
 
-from unittest.mock import MagicMock, patch
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
 
 from ebook_calibre_analyzer.__main__ import run_copy
+from tests.main.helpers import FakeArgs, write_test_csv
 
 
 class TestRunCopy:
     """Test cases for run_copy function."""
 
-    def test_returns_1_when_csv_missing(self, temp_dir):
+    def test_returns_1_when_csv_missing(self, fake_fs):
         """Test that run_copy returns 1 when CSV file doesn't exist."""
-        args = MagicMock()
-        args.csv_file = temp_dir / "nonexistent.csv"
-        args.ebooks_folder = temp_dir / "ebooks"
-        args.target_folder = temp_dir / "target"
-        args.conflict_handling = "rename"
-        args.dry_run = False
-        args.workers = 4
-        args.verbose = False
+        args = FakeArgs(
+            csv_file=fake_fs / "nonexistent.csv",
+            ebooks_folder=fake_fs / "ebooks",
+            target_folder=fake_fs / "target",
+            workers=4,
+        )
 
         result = run_copy(args)
         assert result == 1
 
-    def test_returns_0_on_successful_copy(self, temp_dir):
+    def test_returns_0_on_successful_copy(self, temp_dir, copy_args):
         """Test that run_copy returns 0 on successful copy (no failures)."""
         csv_file = temp_dir / "test.csv"
         ebooks = temp_dir / "ebooks"
@@ -37,15 +39,9 @@ class TestRunCopy:
         source_file.write_bytes(content)
 
         # Create CSV with proper format
-        import csv
-
-        with open(csv_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["relative_path", "filename", "file_size", "full_path", "processed_at"],
-            )
-            writer.writeheader()
-            writer.writerow(
+        write_test_csv(
+            csv_file,
+            [
                 {
                     "relative_path": "book.pdf",
                     "filename": "book.pdf",
@@ -53,16 +49,10 @@ class TestRunCopy:
                     "full_path": str(source_file),
                     "processed_at": "2024-01-01T00:00:00",
                 }
-            )
+            ],
+        )
 
-        args = MagicMock()
-        args.csv_file = csv_file
-        args.ebooks_folder = ebooks
-        args.target_folder = target
-        args.conflict_handling = "rename"
-        args.dry_run = False
-        args.workers = 4
-        args.verbose = False
+        args = replace(copy_args, csv_file=csv_file, ebooks_folder=ebooks, target_folder=target)
 
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_copy(args)
@@ -72,7 +62,7 @@ class TestRunCopy:
             assert (target / "book.pdf").exists()
             assert (target / "book.pdf").read_bytes() == content
 
-    def test_returns_1_when_some_files_fail(self, temp_dir):
+    def test_returns_1_when_some_files_fail(self, temp_dir, copy_args):
         """Test that run_copy returns 1 when some files fail."""
         csv_file = temp_dir / "test.csv"
         ebooks = temp_dir / "ebooks"
@@ -80,15 +70,9 @@ class TestRunCopy:
         ebooks.mkdir()
 
         # Create CSV with non-existent file - need proper CSV format
-        import csv
-
-        with open(csv_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["relative_path", "filename", "file_size", "full_path", "processed_at"],
-            )
-            writer.writeheader()
-            writer.writerow(
+        write_test_csv(
+            csv_file,
+            [
                 {
                     "relative_path": "missing.pdf",
                     "filename": "missing.pdf",
@@ -96,88 +80,53 @@ class TestRunCopy:
                     "full_path": str(ebooks / "missing.pdf"),
                     "processed_at": "2024-01-01T00:00:00",
                 }
-            )
+            ],
+        )
 
-        args = MagicMock()
-        args.csv_file = csv_file
-        args.ebooks_folder = ebooks
-        args.target_folder = target
-        args.conflict_handling = "rename"
-        args.dry_run = False
-        args.workers = 4
-        args.verbose = False
+        args = replace(copy_args, csv_file=csv_file, ebooks_folder=ebooks, target_folder=target)
 
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_copy(args)
             # Should return 1 when files fail (implementation returns 1 if stats["failed"] > 0)
             assert result == 1
 
-    def test_handles_dry_run_mode(self, temp_dir):
+    def test_handles_dry_run_mode(self, copy_args):
         """Test that run_copy handles dry-run mode."""
-        csv_file = temp_dir / "test.csv"
-        ebooks = temp_dir / "ebooks"
-        target = temp_dir / "target"
-        ebooks.mkdir()
-
-        csv_file.write_text("relative_path,filename,file_size,full_path,processed_at\n")
-
-        args = MagicMock()
-        args.csv_file = csv_file
-        args.ebooks_folder = ebooks
-        args.target_folder = target
-        args.conflict_handling = "rename"
-        args.dry_run = True
-        args.workers = 4
-        args.verbose = False
+        args = replace(copy_args, dry_run=True)
 
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_copy(args)
             # Should handle dry-run without error
             assert result in [0, 1]
 
-    def test_handles_conflict_modes(self, temp_dir):
-        """Test that run_copy handles conflict modes (rename, skip, overwrite)."""
-        csv_file = temp_dir / "test.csv"
-        ebooks = temp_dir / "ebooks"
-        target = temp_dir / "target"
-        ebooks.mkdir()
-
-        csv_file.write_text("relative_path,filename,file_size,full_path,processed_at\n")
-
-        for mode in ["rename", "skip", "overwrite"]:
-            args = MagicMock()
-            args.csv_file = csv_file
-            args.ebooks_folder = ebooks
-            args.target_folder = target
-            args.conflict_handling = mode
-            args.dry_run = False
-            args.workers = 4
-            args.verbose = False
+    @pytest.mark.parametrize("mode", ["rename", "skip", "overwrite"])
+    def test_handles_conflict_modes(self, copy_args, mode):
+        """Test that run_copy handles each conflict mode (rename, skip, overwrite)."""
+        args = replace(copy_args, conflict_handling=mode)
 
-            with patch("ebook_calibre_analyzer.__main__.print"):
-                result = run_copy(args)
-                # Should handle all modes
-                assert result in [0, 1]
+        with patch("ebook_calibre_analyzer.__main__.print"):
+            result = run_copy(args)
+            assert result in [0, 1]
 
-    def test_returns_1_when_ebooks_folder_missing(self, temp_dir):
+    def test_returns_1_when_ebooks_folder_missing(self, copy_args, tmp_path):
         """Test that run_copy returns 1 when ebooks folder doesn't exist."""
-        csv_file = temp_dir / "test.csv"
-        csv_file.write_text("relative_path,filename,file_size,full_path,processed_at\n")
+        args = replace(copy_args, ebooks_folder=tmp_path / "nonexistent")
 
-        args = MagicMock()
-        args.csv_file = csv_file
-        args.ebooks_folder = temp_dir / "nonexistent"
-        args.target_folder = temp_dir / "target"
-        args.conflict_handling = "rename"
-        args.dry_run = False
-        args.workers = 4
-        args.verbose = False
+        with patch("ebook_calibre_analyzer.__main__.print"):
+            result = run_copy(args)
+            assert result == 1
+
+    def test_returns_1_when_target_is_a_file(self, copy_args, tmp_path):
+        """Test that run_copy returns 1 when the target path is an existing file."""
+        target = tmp_path / "target"
+        target.write_bytes(b"content")
+        args = replace(copy_args, target_folder=target)
 
         with patch("ebook_calibre_analyzer.__main__.print"):
             result = run_copy(args)
             assert result == 1
 
-    def test_handles_verbose_output(self, temp_dir):
+    def test_handles_verbose_output(self, temp_dir, copy_args):
         """Test that run_copy handles verbose output."""
         csv_file = temp_dir / "test.csv"
         ebooks = temp_dir / "ebooks"
@@ -187,15 +136,9 @@ class TestRunCopy:
         source_file = ebooks / "book.pdf"
         source_file.write_bytes(b"content")
 
-        import csv
-
-        with open(csv_file, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["relative_path", "filename", "file_size", "full_path", "processed_at"],
-            )
-            writer.writeheader()
-            writer.writerow(
+        write_test_csv(
+            csv_file,
+            [
                 {
                     "relative_path": "book.pdf",
                     "filename": "book.pdf",
@@ -203,16 +146,16 @@ class TestRunCopy:
                     "full_path": str(source_file),
                     "processed_at": "2024-01-01T00:00:00",
                 }
-            )
-
-        args = MagicMock()
-        args.csv_file = csv_file
-        args.ebooks_folder = ebooks
-        args.target_folder = target
-        args.conflict_handling = "rename"
-        args.dry_run = False
-        args.workers = 4
-        args.verbose = True  # Enable verbose
+            ],
+        )
+
+        args = replace(
+            copy_args,
+            csv_file=csv_file,
+            ebooks_folder=ebooks,
+            target_folder=target,
+            verbose=True,  # Enable verbose
+        )
 
         # With verbose=True, loguru will output DEBUG messages
         # Just verify the function runs successfully
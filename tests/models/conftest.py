@@ -0,0 +1,33 @@
+"""
+Shared fixtures for model tests.
+"""
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from ebook_calibre_analyzer.models import EbookFile
+
+
+@pytest.fixture(scope="session")
+def temp_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    One directory for all model tests, overriding the per-test ``temp_dir``.
+
+    Model tests only build paths under it and never create files, so sharing
+    it is safe and skips a directory create/remove per test.
+    """
+    return tmp_path_factory.mktemp("ebook_tests")
+
+
+@pytest.fixture(scope="module")
+def shared_pdf_file(
+    tmp_path_factory: pytest.TempPathFactory, ebook_file_factory: Callable[..., EbookFile]
+) -> EbookFile:
+    """
+    A 100-byte PDF EbookFile built once per module.
+
+    Tests must not modify it; use ``ebook_file_factory`` for a private instance.
+    """
+    return ebook_file_factory(tmp_path_factory.mktemp("models"), "test_book.pdf")
@@ -2,111 +2,129 @@
 Tests for EbookFile class.
 """
 
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
 
 from ebook_calibre_analyzer.models import EbookFile
 
+_SUBDIR_BOOK = Path("subdir/book.pdf")
+
+
+@pytest.fixture(scope="class")
+def to_dict_result(shared_pdf_file):
+    """``shared_pdf_file.to_dict()``, computed once for the read-only to_dict tests."""
+    return shared_pdf_file.to_dict()
+
+
+@pytest.fixture(scope="module")
+def base_from_dict_payload(temp_dir):
+    """
+    A valid from_dict row for test.pdf; copy it with ``{**base, ...}`` to override fields.
+
+    Module scope relies on the session-scoped ``temp_dir`` from the models conftest.
+    """
+    return {
+        "full_path": str(temp_dir / "test.pdf"),
+        "relative_path": "test.pdf",
+        "filename": "test.pdf",
+        "file_size": "100",
+    }
+
 
 class TestEbookFile:
     """Test cases for EbookFile class."""
 
-    def test_get_size_hash_returns_file_size_when_none(self, sample_ebook_file):
+    def test_get_size_hash_returns_file_size_when_none(self, ebook_file_factory, temp_dir):
         """Test that get_size_hash returns file_size when size_hash is None."""
-        sample_ebook_file.size_hash = None
-        assert sample_ebook_file.get_size_hash() == sample_ebook_file.file_size
+        file = ebook_file_factory(temp_dir)
+        file.size_hash = None
+        assert file.get_size_hash() == file.file_size
 
-    def test_get_size_hash_sets_size_hash_when_none(self, sample_ebook_file):
+    def test_get_size_hash_sets_size_hash_when_none(self, ebook_file_factory, temp_dir):
         """Test that get_size_hash sets size_hash to file_size when None."""
-        sample_ebook_file.size_hash = None
-        sample_ebook_file.get_size_hash()
-        assert sample_ebook_file.size_hash == sample_ebook_file.file_size
+        file = ebook_file_factory(temp_dir)
+        file.size_hash = None
+        file.get_size_hash()
+        assert file.size_hash == file.file_size
 
-    def test_get_size_hash_returns_cached_value(self, sample_ebook_file):
+    def test_get_size_hash_returns_cached_value(self, ebook_file_factory, temp_dir):
         """Test that get_size_hash returns cached size_hash when already set."""
-        sample_ebook_file.size_hash = 999
-        assert sample_ebook_file.get_size_hash() == 999
-        assert sample_ebook_file.get_size_hash() == 999  # Should return same value
+        file = ebook_file_factory(temp_dir)
+        file.size_hash = 999
+        assert file.get_size_hash() == 999
+        assert file.get_size_hash() == 999  # Should return same value
 
-    def test_get_size_hash_handles_zero_size(self, temp_dir):
+    def test_get_size_hash_handles_zero_size(self, ebook_file_factory, temp_dir):
         """Test that get_size_hash handles zero file size."""
-        file = EbookFile(
-            full_path=temp_dir / "empty.pdf",
-            relative_path=Path("empty.pdf"),
-            filename="empty.pdf",
-            file_size=0,
-            file_extension=".pdf",
-        )
+        file = ebook_file_factory(temp_dir, "empty.pdf", size=0)
         assert file.get_size_hash() == 0
 
-    def test_get_size_hash_handles_large_size(self, temp_dir):
+    def test_get_size_hash_handles_large_size(self, ebook_file_factory, temp_dir):
         """Test that get_size_hash handles very large file sizes."""
         large_size = 500_000_000_000  # 500GB
-        file = EbookFile(
-            full_path=temp_dir / "large.pdf",
-            relative_path=Path("large.pdf"),
-            filename="large.pdf",
-            file_size=large_size,
-            file_extension=".pdf",
-        )
+        file = ebook_file_factory(temp_dir, "large.pdf", size=large_size)
         assert file.get_size_hash() == large_size
 
-    def test_to_dict_returns_all_keys(self, sample_ebook_file):
+    def test_full_path_str_matches_full_path(self, shared_pdf_file):
+        """Test that full_path_str is the string form of full_path."""
+        assert shared_pdf_file.full_path_str == str(shared_pdf_file.full_path)
+
+    def test_relative_path_str_matches_relative_path(self, shared_pdf_file):
+        """Test that relative_path_str is the string form of relative_path."""
+        assert shared_pdf_file.relative_path_str == str(shared_pdf_file.relative_path)
+        assert shared_pdf_file.to_dict()["relative_path"] == shared_pdf_file.relative_path_str
+
+    def test_full_path_str_ignored_in_equality(self, ebook_file_factory, shared_pdf_file):
+        """Test that the cached full_path_str does not affect equality or repr."""
+        other = ebook_file_factory(
+            shared_pdf_file.full_path.parent,
+            shared_pdf_file.filename,
+            size=shared_pdf_file.file_size,
+        )
+        assert other.full_path_str == str(other.full_path)
+        assert other == replace(shared_pdf_file)
+        assert "full_path_str" not in repr(other)
+
+    def test_path_strs_follow_reassigned_paths(self, ebook_file_factory, temp_dir):
+        """Test that full_path_str and relative_path_str update when the paths change."""
+        file = ebook_file_factory(temp_dir, "old.pdf")
+        assert file.full_path_str == str(temp_dir / "old.pdf")
+        assert file.relative_path_str == "old.pdf"
+
+        file.full_path = temp_dir / "new.pdf"
+        file.relative_path = Path("new.pdf")
+        assert file.full_path_str == str(temp_dir / "new.pdf")
+        assert file.relative_path_str == "new.pdf"
+
+    def test_to_dict_returns_all_keys(self, to_dict_result):
         """Test that to_dict returns dictionary with all required keys."""
-        result = sample_ebook_file.to_dict()
         required_keys = {"relative_path", "filename", "file_size", "full_path"}
-        assert set(result.keys()) == required_keys
+        assert set(to_dict_result.keys()) == required_keys
 
-    def test_to_dict_converts_paths_to_strings(self, sample_ebook_file):
+    def test_to_dict_converts_paths_to_strings(self, to_dict_result):
         """Test that to_dict converts Path objects to strings correctly."""
-        result = sample_ebook_file.to_dict()
-        assert isinstance(result["relative_path"], str)
-        assert isinstance(result["full_path"], str)
+        assert isinstance(to_dict_result["relative_path"], str)
+        assert isinstance(to_dict_result["full_path"], str)
 
-    def test_to_dict_handles_relative_paths(self, temp_dir):
+    def test_to_dict_handles_relative_paths(self, ebook_file_factory, temp_dir):
         """Test that to_dict handles relative paths with subdirectories."""
-        file = EbookFile(
-            full_path=temp_dir / "subdir" / "book.pdf",
-            relative_path=Path("subdir/book.pdf"),
-            filename="book.pdf",
-            file_size=100,
-            file_extension=".pdf",
-        )
+        file = ebook_file_factory(temp_dir, "subdir/book.pdf")
         result = file.to_dict()
         assert result["relative_path"] == "subdir/book.pdf"
 
-    def test_to_dict_handles_path_separators(self, temp_dir):
-        """Test that to_dict handles Windows and Unix path separators."""
-        # Unix-style path
-        file = EbookFile(
-            full_path=temp_dir / "subdir" / "book.pdf",
-            relative_path=Path("subdir/book.pdf"),
-            filename="book.pdf",
-            file_size=100,
-            file_extension=".pdf",
-        )
-        result = file.to_dict()
-        # Path should be converted to string (OS-dependent)
-        assert isinstance(result["relative_path"], str)
-
-    def test_to_dict_preserves_field_values(self, sample_ebook_file):
+    def test_to_dict_preserves_field_values(self, to_dict_result, shared_pdf_file):
         """Test that to_dict preserves all field values correctly."""
-        result = sample_ebook_file.to_dict()
-        assert result["filename"] == sample_ebook_file.filename
-        assert result["file_size"] == sample_ebook_file.file_size
-        assert result["relative_path"] == str(sample_ebook_file.relative_path)
-        assert result["full_path"] == str(sample_ebook_file.full_path)
+        result = to_dict_result
+        assert result["filename"] == shared_pdf_file.filename
+        assert result["file_size"] == shared_pdf_file.file_size
+        assert result["relative_path"] == str(shared_pdf_file.relative_path)
+        assert result["full_path"] == str(shared_pdf_file.full_path)
 
-    def test_from_dict_creates_ebook_file(self, temp_dir):
+    def test_from_dict_creates_ebook_file(self, base_from_dict_payload, temp_dir):
         """Test that from_dict creates EbookFile from valid dictionary."""
-        data = {
-            "full_path": str(temp_dir / "test.pdf"),
-            "relative_path": "test.pdf",
-            "filename": "test.pdf",
-            "file_size": "100",
-        }
-        file = EbookFile.from_dict(data, temp_dir)
+        file = EbookFile.from_dict(base_from_dict_payload, temp_dir)
         assert isinstance(file, EbookFile)
         assert file.filename == "test.pdf"
         assert file.file_size == 100
@@ -118,54 +136,33 @@ class TestEbookFile:
         with pytest.raises(KeyError):
             EbookFile.from_dict(data, temp_dir)
 
-    def test_from_dict_handles_invalid_file_size(self, temp_dir):
+    def test_from_dict_handles_invalid_file_size(self, base_from_dict_payload, temp_dir):
         """Test that from_dict handles invalid file_size (ValueError)."""
-        data = {
-            "full_path": str(temp_dir / "test.pdf"),
-            "relative_path": "test.pdf",
-            "filename": "test.pdf",
-            "file_size": "not_a_number",
-        }
+        data = {**base_from_dict_payload, "file_size": "not_a_number"}
         with pytest.raises(ValueError):
             EbookFile.from_dict(data, temp_dir)
 
-    def test_from_dict_sets_file_extension(self, temp_dir):
-        """Test that from_dict correctly sets file_extension from full_path."""
-        data = {
-            "full_path": str(temp_dir / "test.epub"),
-            "relative_path": "test.epub",
-            "filename": "test.epub",
-            "file_size": "100",
-        }
-        file = EbookFile.from_dict(data, temp_dir)
-        assert file.file_extension == ".epub"
-
-    def test_from_dict_handles_relative_paths(self, temp_dir):
-        """Test that from_dict handles relative paths correctly."""
+    @pytest.mark.parametrize(
+        "relative_path, attr, expected",
+        [
+            ("test.epub", "file_extension", ".epub"),
+            ("subdir/book.pdf", "relative_path", _SUBDIR_BOOK),
+        ],
+        ids=["file_extension", "relative_path"],
+    )
+    def test_from_dict_handles_paths(self, temp_dir, relative_path, attr, expected):
+        """Test that from_dict derives extension and paths from the row correctly."""
         data = {
-            "full_path": str(temp_dir / "subdir" / "book.pdf"),
-            "relative_path": "subdir/book.pdf",
-            "filename": "book.pdf",
-            "file_size": "100",
-        }
-        file = EbookFile.from_dict(data, temp_dir)
-        assert file.relative_path == Path("subdir/book.pdf")
-
-    def test_from_dict_handles_absolute_paths(self, temp_dir):
-        """Test that from_dict handles absolute paths correctly."""
-        abs_path = temp_dir / "book.pdf"
-        data = {
-            "full_path": str(abs_path),
-            "relative_path": "book.pdf",
-            "filename": "book.pdf",
+            "full_path": str(temp_dir / relative_path),
+            "relative_path": relative_path,
+            "filename": Path(relative_path).name,
             "file_size": "100",
         }
         file = EbookFile.from_dict(data, temp_dir)
-        assert file.full_path == abs_path
+        assert getattr(file, attr) == expected
 
-    def test_from_dict_handles_base_path_resolution(self, temp_dir):
-        """Test that from_dict handles base_path resolution."""
-        # base_path is used for context but full_path should be absolute
+    def test_from_dict_resolves_full_path(self, temp_dir):
+        """Test that from_dict builds an absolute full_path under the base path."""
         data = {
             "full_path": str(temp_dir / "book.pdf"),
             "relative_path": "book.pdf",
@@ -173,4 +170,5 @@ class TestEbookFile:
             "file_size": "100",
         }
         file = EbookFile.from_dict(data, temp_dir)
+        assert file.full_path == temp_dir / "book.pdf"
         assert file.full_path.is_absolute()
@@ -2,246 +2,187 @@
 Tests for FileCollection class.
 """
 
-from pathlib import Path
+import pytest
 
-from ebook_calibre_analyzer.models import EbookFile, FileCollection
+from ebook_calibre_analyzer.models import FileCollection
+
+
+@pytest.fixture
+def empty_collection():
+    """A new FileCollection with no files."""
+    return FileCollection()
+
+
+@pytest.fixture
+def collection_with_one_file(empty_collection, shared_pdf_file):
+    """A collection holding only ``shared_pdf_file``."""
+    empty_collection.add_file(shared_pdf_file)
+    return empty_collection
+
+
+@pytest.fixture
+def collection_two_same_size(empty_collection, ebook_file_factory, temp_dir):
+    """A collection holding file1.pdf and file2.pdf, both 100 bytes."""
+    empty_collection.add_file(ebook_file_factory(temp_dir, "file1.pdf", size=100))
+    empty_collection.add_file(ebook_file_factory(temp_dir, "file2.pdf", size=100))
+    return empty_collection
+
+
+@pytest.fixture
+def collection_two_sizes(empty_collection, ebook_file_factory, temp_dir):
+    """A collection holding file1.pdf (100 bytes) and file2.pdf (200 bytes)."""
+    empty_collection.add_file(ebook_file_factory(temp_dir, "file1.pdf", size=100))
+    empty_collection.add_file(ebook_file_factory(temp_dir, "file2.pdf", size=200))
+    return empty_collection
 
 
 class TestFileCollection:
     """Test cases for FileCollection class."""
 
-    def test_init_creates_empty_collection(self):
+    def test_init_creates_empty_collection(self, empty_collection):
         """Test that __init__ initializes empty collection."""
-        collection = FileCollection()
-        assert len(collection.files) == 0
+        assert len(empty_collection.files) == 0
 
-    def test_init_initializes_lookup_dicts(self):
+    def test_init_initializes_lookup_dicts(self, empty_collection):
         """Test that __init__ initializes all lookup dictionaries as empty."""
-        collection = FileCollection()
-        assert len(collection.by_size) == 0
-        assert len(collection.by_size_and_1k) == 0
-        assert len(collection.by_full_hash) == 0
+        assert len(empty_collection.by_size) == 0
+        assert len(empty_collection.by_size_and_1k) == 0
+        assert len(empty_collection.by_full_hash) == 0
 
-    def test_add_file_adds_to_files_list(self, sample_ebook_file):
+    def test_add_file_adds_to_files_list(self, collection_with_one_file, shared_pdf_file):
         """Test that add_file adds file to files list."""
-        collection = FileCollection()
-        collection.add_file(sample_ebook_file)
-        assert sample_ebook_file in collection.files
-        assert len(collection.files) == 1
+        assert shared_pdf_file in collection_with_one_file.files
+        assert len(collection_with_one_file.files) == 1
 
-    def test_add_file_adds_to_by_size(self, sample_ebook_file):
+    def test_add_file_adds_to_by_size(self, collection_with_one_file, shared_pdf_file):
         """Test that add_file adds file to by_size dictionary."""
-        collection = FileCollection()
-        collection.add_file(sample_ebook_file)
-        size = sample_ebook_file.file_size
-        assert sample_ebook_file in collection.by_size[size]
+        size = shared_pdf_file.file_size
+        assert shared_pdf_file in collection_with_one_file.by_size[size]
 
-    def test_add_file_adds_to_by_size_and_1k(self, temp_dir):
+    def test_add_file_adds_to_by_size_and_1k(self, empty_collection, ebook_file_factory, temp_dir):
         """Test that add_file adds file to by_size_and_1k when first_1k_hash is set."""
-        file = EbookFile(
-            full_path=temp_dir / "test.pdf",
-            relative_path=Path("test.pdf"),
-            filename="test.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            first_1k_hash=b"test_hash",
-        )
-        collection = FileCollection()
-        collection.add_file(file)
+        file = ebook_file_factory(temp_dir, "test.pdf", first_1k_hash=b"test_hash")
+        empty_collection.add_file(file)
         size = file.file_size
         key = (size, b"test_hash")
-        assert file in collection.by_size_and_1k[key]
+        assert file in empty_collection.by_size_and_1k[key]
 
-    def test_add_file_adds_to_by_full_hash(self, temp_dir):
+    def test_add_file_adds_to_by_full_hash(self, empty_collection, ebook_file_factory, temp_dir):
         """Test that add_file adds file to by_full_hash when full_hash is set."""
-        file = EbookFile(
-            full_path=temp_dir / "test.pdf",
-            relative_path=Path("test.pdf"),
-            filename="test.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            full_hash=b"full_hash_value",
-        )
-        collection = FileCollection()
-        collection.add_file(file)
-        assert collection.by_full_hash[b"full_hash_value"] == file
+        file = ebook_file_factory(temp_dir, "test.pdf", full_hash=b"full_hash_value")
+        empty_collection.add_file(file)
+        assert empty_collection.by_full_hash[b"full_hash_value"] == file
 
-    def test_add_file_handles_multiple_same_size(self, temp_dir):
+    def test_add_file_handles_multiple_same_size(self, collection_two_same_size):
         """Test that add_file handles multiple files with same size."""
-        file1 = EbookFile(
-            full_path=temp_dir / "file1.pdf",
-            relative_path=Path("file1.pdf"),
-            filename="file1.pdf",
-            file_size=100,
-            file_extension=".pdf",
-        )
-        file2 = EbookFile(
-            full_path=temp_dir / "file2.pdf",
-            relative_path=Path("file2.pdf"),
-            filename="file2.pdf",
-            file_size=100,
-            file_extension=".pdf",
-        )
-        collection = FileCollection()
-        collection.add_file(file1)
-        collection.add_file(file2)
-        assert len(collection.by_size[100]) == 2
-        assert file1 in collection.by_size[100]
-        assert file2 in collection.by_size[100]
-
-    def test_add_file_handles_multiple_same_size_and_1k(self, temp_dir):
+        file1, file2 = collection_two_same_size.files
+        # EbookFile is an unhashable dataclass, so compare identities
+        by100 = {id(file) for file in collection_two_same_size.by_size[100]}
+        assert len(collection_two_same_size.by_size[100]) == 2
+        assert {id(file1), id(file2)} <= by100
+
+    def test_add_file_handles_multiple_same_size_and_1k(
+        self, empty_collection, ebook_file_factory, temp_dir
+    ):
         """Test that add_file handles multiple files with same (size, 1k_hash)."""
         hash_1k = b"same_hash"
-        file1 = EbookFile(
-            full_path=temp_dir / "file1.pdf",
-            relative_path=Path("file1.pdf"),
-            filename="file1.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            first_1k_hash=hash_1k,
-        )
-        file2 = EbookFile(
-            full_path=temp_dir / "file2.pdf",
-            relative_path=Path("file2.pdf"),
-            filename="file2.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            first_1k_hash=hash_1k,
-        )
-        collection = FileCollection()
-        collection.add_file(file1)
-        collection.add_file(file2)
+        file1 = ebook_file_factory(temp_dir, "file1.pdf", first_1k_hash=hash_1k)
+        file2 = ebook_file_factory(temp_dir, "file2.pdf", first_1k_hash=hash_1k)
+        empty_collection.add_file(file1)
+        empty_collection.add_file(file2)
         key = (100, hash_1k)
-        assert len(collection.by_size_and_1k[key]) == 2
+        assert len(empty_collection.by_size_and_1k[key]) == 2
 
-    def test_add_file_handles_duplicate_full_hash(self, temp_dir):
+    def test_add_file_handles_duplicate_full_hash(
+        self, empty_collection, ebook_file_factory, temp_dir
+    ):
         """Test that add_file handles duplicate full_hash (overwrites)."""
         hash_value = b"duplicate_hash"
-        file1 = EbookFile(
-            full_path=temp_dir / "file1.pdf",
-            relative_path=Path("file1.pdf"),
-            filename="file1.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            full_hash=hash_value,
-        )
-        file2 = EbookFile(
-            full_path=temp_dir / "file2.pdf",
-            relative_path=Path("file2.pdf"),
-            filename="file2.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            full_hash=hash_value,
-        )
-        collection = FileCollection()
-        collection.add_file(file1)
-        collection.add_file(file2)
+        file1 = ebook_file_factory(temp_dir, "file1.pdf", full_hash=hash_value)
+        file2 = ebook_file_factory(temp_dir, "file2.pdf", full_hash=hash_value)
+        empty_collection.add_file(file1)
+        empty_collection.add_file(file2)
         # Last file should overwrite
-        assert collection.by_full_hash[hash_value] == file2
+        assert empty_collection.by_full_hash[hash_value] == file2
 
-    def test_get_files_by_size_returns_empty_for_nonexistent(self):
+    def test_get_files_by_size_returns_empty_for_nonexistent(self, empty_collection):
         """Test that get_files_by_size returns empty list for non-existent size."""
-        collection = FileCollection()
-        assert collection.get_files_by_size(999) == []
+        assert empty_collection.get_files_by_size(999) == []
 
-    def test_get_files_by_size_returns_matching_files(self, sample_ebook_file):
+    def test_get_files_by_size_returns_matching_files(
+        self, collection_with_one_file, shared_pdf_file
+    ):
         """Test that get_files_by_size returns all files with matching size."""
-        collection = FileCollection()
-        collection.add_file(sample_ebook_file)
-        size = sample_ebook_file.file_size
-        result = collection.get_files_by_size(size)
-        assert sample_ebook_file in result
+        size = shared_pdf_file.file_size
+        result = collection_with_one_file.get_files_by_size(size)
+        assert shared_pdf_file in result
         assert len(result) == 1
 
-    def test_get_files_by_size_handles_multiple_sizes(self, temp_dir):
+    def test_get_files_by_size_handles_multiple_sizes(self, collection_two_sizes):
         """Test that get_files_by_size returns correct files when multiple sizes exist."""
-        file1 = EbookFile(
-            full_path=temp_dir / "file1.pdf",
-            relative_path=Path("file1.pdf"),
-            filename="file1.pdf",
-            file_size=100,
-            file_extension=".pdf",
-        )
-        file2 = EbookFile(
-            full_path=temp_dir / "file2.pdf",
-            relative_path=Path("file2.pdf"),
-            filename="file2.pdf",
-            file_size=200,
-            file_extension=".pdf",
-        )
-        collection = FileCollection()
-        collection.add_file(file1)
-        collection.add_file(file2)
-        assert len(collection.get_files_by_size(100)) == 1
-        assert len(collection.get_files_by_size(200)) == 1
-        assert file1 in collection.get_files_by_size(100)
-        assert file2 in collection.get_files_by_size(200)
-
-    def test_get_files_by_size_and_1k_returns_empty_for_nonexistent(self):
+        file1, file2 = collection_two_sizes.files
+        by100 = {id(file) for file in collection_two_sizes.get_files_by_size(100)}
+        by200 = {id(file) for file in collection_two_sizes.get_files_by_size(200)}
+        assert by100 == {id(file1)}
+        assert by200 == {id(file2)}
+
+    def test_get_files_by_size_and_1k_returns_empty_for_nonexistent(self, empty_collection):
         """Test that get_files_by_size_and_1k returns empty list for non-existent combination."""
-        collection = FileCollection()
-        assert collection.get_files_by_size_and_1k(100, b"nonexistent") == []
+        assert empty_collection.get_files_by_size_and_1k(100, b"nonexistent") == []
 
-    def test_get_files_by_size_and_1k_returns_matching_files(self, temp_dir):
+    def test_get_files_by_size_and_1k_returns_matching_files(
+        self, empty_collection, ebook_file_factory, temp_dir
+    ):
         """Test that get_files_by_size_and_1k returns all files with matching size and 1k hash."""
         hash_1k = b"test_hash"
-        file = EbookFile(
-            full_path=temp_dir / "test.pdf",
-            relative_path=Path("test.pdf"),
-            filename="test.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            first_1k_hash=hash_1k,
-        )
-        collection = FileCollection()
-        collection.add_file(file)
-        result = collection.get_files_by_size_and_1k(100, hash_1k)
+        file = ebook_file_factory(temp_dir, "test.pdf", first_1k_hash=hash_1k)
+        empty_collection.add_file(file)
+        result = empty_collection.get_files_by_size_and_1k(100, hash_1k)
         assert file in result
         assert len(result) == 1
 
-    def test_get_file_by_full_hash_returns_none_for_nonexistent(self):
+    def test_get_file_by_full_hash_returns_none_for_nonexistent(self, empty_collection):
         """Test that get_file_by_full_hash returns None for non-existent hash."""
-        collection = FileCollection()
-        assert collection.get_file_by_full_hash(b"nonexistent") is None
+        assert empty_collection.get_file_by_full_hash(b"nonexistent") is None
 
-    def test_get_file_by_full_hash_returns_correct_file(self, temp_dir):
+    def test_get_file_by_full_hash_returns_correct_file(
+        self, empty_collection, ebook_file_factory, temp_dir
+    ):
         """Test that get_file_by_full_hash returns correct file for existing hash."""
         hash_value = b"test_hash"
-        file = EbookFile(
-            full_path=temp_dir / "test.pdf",
-            relative_path=Path("test.pdf"),
-            filename="test.pdf",
-            file_size=100,
-            file_extension=".pdf",
-            full_hash=hash_value,
-        )
-        collection = FileCollection()
-        collection.add_file(file)
-        assert collection.get_file_by_full_hash(hash_value) == file
+        file = ebook_file_factory(temp_dir, "test.pdf", full_hash=hash_value)
+        empty_collection.add_file(file)
+        assert empty_collection.get_file_by_full_hash(hash_value) == file
 
-    def test_get_unique_sizes_returns_empty_set(self):
+    def test_get_unique_sizes_returns_empty_set(self, empty_collection):
         """Test that get_unique_sizes returns empty set for empty collection."""
-        collection = FileCollection()
-        assert collection.get_unique_sizes() == set()
+        assert empty_collection.get_unique_sizes() == set()
 
-    def test_get_unique_sizes_returns_all_sizes(self, temp_dir):
+    def test_get_unique_sizes_returns_all_sizes(self, collection_two_sizes):
         """Test that get_unique_sizes returns set of all unique sizes."""
-        file1 = EbookFile(
-            full_path=temp_dir / "file1.pdf",
-            relative_path=Path("file1.pdf"),
-            filename="file1.pdf",
-            file_size=100,
-            file_extension=".pdf",
-        )
-        file2 = EbookFile(
-            full_path=temp_dir / "file2.pdf",
-            relative_path=Path("file2.pdf"),
-            filename="file2.pdf",
-            file_size=200,
-            file_extension=".pdf",
-        )
-        collection = FileCollection()
-        collection.add_file(file1)
-        collection.add_file(file2)
-        sizes = collection.get_unique_sizes()
+        sizes = collection_two_sizes.get_unique_sizes()
         assert sizes == {100, 200}
+
+    def test_extend_matches_add_file(self, ebook_file_factory, temp_dir):
+        """Test that extend builds the same indexes as add_file for each file."""
+        files = [
+            ebook_file_factory(
+                temp_dir,
+                f"file{i}.pdf",
+                size=100 * (i % 2 + 1),
+                first_1k_hash=b"1k" if i < 2 else None,
+                full_hash=bytes([i]) if i != 1 else None,
+            )
+            for i in range(3)
+        ]
+
+        expected = FileCollection()
+        for file in files:
+            expected.add_file(file)
+        collection = FileCollection()
+        collection.extend(iter(files))
+
+        assert collection.files == expected.files
+        assert collection.by_size == expected.by_size
+        assert collection.by_size_and_1k == expected.by_size_and_1k
+        assert collection.by_full_hash == expected.by_full_hash